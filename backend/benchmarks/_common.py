@@ -0,0 +1,83 @@
+"""
+Shared setup for the HRMS benchmark scripts.
+
+The benchmarks run against a real MongoDB deployment. They connect to
+``BENCH_MONGO_URI`` (falling back to ``MONGO_URI``) and always use a separate
+``hrms_bench`` database, which is dropped and reseeded by each script.
+"""
+import os
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+import mongoengine as me  # noqa: E402
+from pymongo import monitoring  # noqa: E402
+
+BENCH_DB = "hrms_bench"
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Count the commands (round trips) sent to MongoDB."""
+
+    def __init__(self):
+        self.count = 0
+
+    def reset(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def connect_bench_db(listeners=()):
+    """
+    Connect mongoengine to the benchmark database and drop any previous data.
+
+    Args:
+        listeners: PyMongo event listeners to register on the client
+
+    Returns:
+        The pymongo Database used for the benchmark
+    """
+    mongo_uri = os.getenv("BENCH_MONGO_URI") or os.getenv("MONGO_URI")
+    if not mongo_uri:
+        raise SystemExit("Set BENCH_MONGO_URI or MONGO_URI to run the benchmarks.")
+
+    # mongoengine prefers the database named in the URI over ``db``; strip it so
+    # the benchmark can never write into the application database.
+    parts = urlsplit(mongo_uri)
+    mongo_uri = urlunsplit((parts.scheme, parts.netloc, "/", parts.query, parts.fragment))
+
+    me.disconnect()
+    me.connect(db=BENCH_DB, host=mongo_uri, event_listeners=list(listeners))
+    db = me.get_db()
+    db.client.drop_database(BENCH_DB)
+    return db
+
+
+def timed(func, repeat=5):
+    """
+    Run func repeatedly and return (best_seconds, last_result).
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
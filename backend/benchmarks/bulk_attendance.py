@@ -0,0 +1,73 @@
+"""
+Benchmark POST /api/attendance/bulk/ against repeated POST /api/attendance/mark/.
+
+Seeds N employees, marks one day of attendance for all of them through each
+path and reports round trips, wall time and rows per second.
+
+Usage:
+    BENCH_MONGO_URI=mongodb://localhost:27017 python benchmarks/bulk_attendance.py
+    python benchmarks/bulk_attendance.py --employees 8000
+"""
+import argparse
+import time
+
+from _common import CommandCounter, connect_bench_db
+
+from rest_framework.test import APIRequestFactory
+
+from hrms.models import Attendance, Employee
+from hrms.views import mark_attendance, mark_attendance_bulk
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=2000)
+    args = parser.parse_args()
+
+    counter = CommandCounter()
+    factory = APIRequestFactory()
+    db = connect_bench_db([counter])
+    db.employees.insert_many(
+        {
+            "employee_id": f"EMP{i:06d}",
+            "full_name": f"Employee {i}",
+            "email": f"employee{i}@example.com",
+            "department": f"Dept {i % 10}",
+        }
+        for i in range(args.employees)
+    )
+    Employee.ensure_indexes()
+    Attendance.ensure_indexes()
+
+    def rows(day):
+        return [
+            {"employee_id": f"EMP{i:06d}", "date": day, "status": "Present" if i % 4 else "Absent"}
+            for i in range(args.employees)
+        ]
+
+    def single(day):
+        for row in rows(day):
+            response = mark_attendance(factory.post("/api/attendance/mark/", row, format="json"))
+            assert response.status_code in (200, 201), response.data
+
+    def bulk(day):
+        request = factory.post("/api/attendance/bulk/", {"records": rows(day)}, format="json")
+        response = mark_attendance_bulk(request)
+        assert response.data["summary"]["error"] == 0, response.data["summary"]
+
+    print(f"{'variant':>8} {'rows':>8} {'round trips':>12} {'seconds':>9} {'rows/s':>10}")
+    timings = {}
+    for name, func, day in (("single", single, "2024-01-01"), ("bulk", bulk, "2024-01-02")):
+        counter.reset()
+        start = time.perf_counter()
+        func(day)
+        timings[name] = time.perf_counter() - start
+        print(f"{name:>8} {args.employees:>8} {counter.count:>12} {timings[name]:>9.2f} "
+              f"{args.employees / timings[name]:>10.0f}")
+
+    print(f"speedup: {timings['single'] / timings['bulk']:.1f}x")
+    db.client.drop_database(db.name)
+
+
+if __name__ == "__main__":
+    main()
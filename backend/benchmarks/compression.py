@@ -0,0 +1,72 @@
+"""
+CPU cost vs bytes saved of the response compression settings.
+
+Renders payloads shaped like the list_employees and employee_attendance
+responses (see json_rendering.py) and a CSV export, then compresses each one
+with several gzip levels and brotli qualities. Reports the compression time,
+the compressed size and the transfer time saved on a slow link, to choose
+HRMS_GZIP_LEVEL / HRMS_BROTLI_QUALITY.
+
+Usage:
+    python benchmarks/compression.py
+    python benchmarks/compression.py --rows 1000 10000 --link-mbps 2
+"""
+import argparse
+import zlib
+
+from _common import timed
+from json_rendering import attendance, employee_list
+
+from hrms.compression import brotli
+from hrms.renderers import dumps
+
+
+def gzip_compress(level):
+    def compress(data):
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+    return compress
+
+
+def brotli_compress(quality):
+    return lambda data: brotli.compress(data, quality=quality)
+
+
+def csv_export(rows):
+    lines = ["id,employee_id,date,status"]
+    lines += [f"{i:024x},EMP{i % 500:06d},20{i % 100:02d}-01-01,{'Present' if i % 3 else 'Absent'}" for i in range(rows)]
+    return ("\r\n".join(lines) + "\r\n").encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--link-mbps", type=float, default=5.0, help="Link speed for the transfer time saved")
+    args = parser.parse_args()
+
+    codecs = [(f"gzip {level}", gzip_compress(level)) for level in (1, 6, 9)]
+    if brotli is not None:
+        codecs += [(f"br {quality}", brotli_compress(quality)) for quality in (1, 4, 6, 11)]
+    else:
+        print("brotli is not installed; skipping it")
+
+    bytes_per_ms = args.link_mbps * 1_000_000 / 8 / 1000
+    print(f"{'payload':<22}{'rows':>7}{'size':>10}  {'codec':<8}{'cpu':>10}{'compressed':>12}{'ratio':>7}{'saved':>11}")
+    for rows in args.rows:
+        payloads = [
+            ("list_employees", dumps(employee_list(rows))),
+            ("employee_attendance", dumps(attendance(rows))),
+            ("csv export", csv_export(rows)),
+        ]
+        for name, body in payloads:
+            for codec, compress in codecs:
+                seconds, compressed = timed(lambda: compress(body))
+                saved_ms = (len(body) - len(compressed)) / bytes_per_ms - seconds * 1000
+                print(
+                    f"{name:<22}{rows:>7}{len(body) / 1024:>7.0f} KiB  {codec:<8}{seconds * 1000:>7.2f} ms"
+                    f"{len(compressed) / 1024:>8.0f} KiB{len(body) / len(compressed):>7.1f}{saved_ms:>8.0f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
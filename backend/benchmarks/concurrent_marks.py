@@ -0,0 +1,76 @@
+"""
+Concurrency check for POST /api/attendance/mark/.
+
+Fires hundreds of parallel marks and verifies that:
+
+* marks racing on the same (employee, date) never return 409 or 500, exactly
+  one of them reports 201 and a single record is stored;
+* marks for distinct dates issued in parallel are all persisted (no lost
+  updates).
+
+Exits non-zero if any check fails.
+
+Usage:
+    BENCH_MONGO_URI=mongodb://localhost:27017 python benchmarks/concurrent_marks.py
+    python benchmarks/concurrent_marks.py --requests 500 --threads 64
+"""
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from _common import connect_bench_db
+
+from rest_framework.test import APIRequestFactory
+
+from hrms.models import Attendance, Employee
+from hrms.views import mark_attendance
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--threads", type=int, default=32)
+    args = parser.parse_args()
+
+    connect_bench_db()
+    Employee.ensure_indexes()
+    Attendance.ensure_indexes()
+    Employee(employee_id="EMP1", full_name="Racer", email="racer@example.com", department="QA").save()
+    factory = APIRequestFactory()
+
+    def mark(payload):
+        return mark_attendance(factory.post("/api/attendance/mark/", payload, format="json")).status_code
+
+    failures = []
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        same_day = [
+            {"employee_id": "EMP1", "date": "2024-01-01", "status": "Present" if i % 2 else "Absent"}
+            for i in range(args.requests)
+        ]
+        codes = Counter(pool.map(mark, same_day))
+        print(f"same (employee, date): {dict(codes)}")
+        if set(codes) - {200, 201} or codes[201] != 1:
+            failures.append(f"expected one 201 and only 200s otherwise, got {dict(codes)}")
+        stored = Attendance.objects(date=date(2024, 1, 1)).count()
+        if stored != 1:
+            failures.append(f"expected 1 record for the contended date, found {stored}")
+
+        start = date(2023, 1, 1)
+        distinct_days = [
+            {"employee_id": "EMP1", "date": str(start + timedelta(days=i)), "status": "Present"}
+            for i in range(args.requests)
+        ]
+        codes = Counter(pool.map(mark, distinct_days))
+        print(f"distinct dates: {dict(codes)}")
+        stored = Attendance.objects(date__gte=start, date__lt=start + timedelta(days=args.requests)).count()
+        if codes != Counter({201: args.requests}) or stored != args.requests:
+            failures.append(f"expected {args.requests} created records, got {dict(codes)} and {stored} stored")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
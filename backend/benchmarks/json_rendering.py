@@ -0,0 +1,87 @@
+"""
+Render time and peak memory of DRF's JSONRenderer vs hrms.renderers.
+
+Builds payloads shaped like the list_employees and employee_attendance
+responses in memory (no MongoDB needed) and renders each one with DRF's
+JSONRenderer, the standard library fallback and orjson (when installed),
+checking that all of them produce the same bytes.
+
+Usage:
+    python benchmarks/json_rendering.py
+    python benchmarks/json_rendering.py --sizes 10000 100000 --repeat 5
+"""
+import argparse
+import tracemalloc
+
+from _common import timed
+
+from rest_framework.renderers import JSONRenderer
+
+from hrms import renderers
+
+
+def employee_list(rows):
+    return [
+        {
+            "id": f"{i:024x}",
+            "employee_id": f"EMP{i:06d}",
+            "full_name": f"Employee Ünïcode {i}",
+            "email": f"employee{i}@example.com",
+            "department": f"Dept {i % 10}",
+            "present_count": i % 200,
+            "absent_count": i % 50,
+        }
+        for i in range(rows)
+    ]
+
+
+def attendance(rows):
+    return {
+        "employee": {"employee_id": "EMP000000", "full_name": "Employee 0", "department": "Dept 0"},
+        "present_days": rows // 2,
+        "absent_days": rows - rows // 2,
+        "records": [
+            {"id": f"{i:024x}", "date": f"20{i % 100:02d}-01-01", "status": "Present" if i % 3 else "Absent"}
+            for i in range(rows)
+        ],
+    }
+
+
+def peak_kib(func):
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    encoders = [("drf JSONRenderer", JSONRenderer().render), ("stdlib fallback", renderers.stdlib_dumps)]
+    if renderers.orjson is not None:
+        encoders.append(("orjson", renderers.orjson_dumps))
+    else:
+        print("orjson is not installed; skipping it")
+
+    print(f"{'payload':<22}{'rows':>8}  {'encoder':<18}{'time':>11}{'peak':>12}{'size':>11}")
+    for rows in args.sizes:
+        for name, payload in (("list_employees", employee_list(rows)), ("employee_attendance", attendance(rows))):
+            expected = None
+            for encoder_name, encode in encoders:
+                seconds, body = timed(lambda: encode(payload), repeat=args.repeat)
+                if expected is None:
+                    expected = body
+                elif body != expected:
+                    raise SystemExit(f"{encoder_name} output differs from DRF's for {name}")
+                print(
+                    f"{name:<22}{rows:>8}  {encoder_name:<18}{seconds * 1000:>8.2f} ms"
+                    f"{peak_kib(lambda: encode(payload)):>8.0f} KiB{len(body) / 1024:>7.0f} KiB"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark GET /api/employees/ against the original per-employee count queries.
+
+"before" replays the original implementation (two count queries per
+employee), "after" calls the current ``list_employees`` view. Both results
+are compared to make sure the JSON is identical.
+
+Usage:
+    BENCH_MONGO_URI=mongodb://localhost:27017 python benchmarks/list_employees.py
+    python benchmarks/list_employees.py --sizes 100 1000 --days 30
+"""
+import argparse
+from datetime import date, datetime, timedelta
+
+from _common import CommandCounter, connect_bench_db, timed
+
+from pymongo import UpdateOne
+from rest_framework.test import APIRequestFactory
+
+from hrms.aggregations import attendance_counts
+from hrms.models import Attendance, Employee
+from hrms.views import list_employees
+
+
+def seed(db, employees, days):
+    db.employees.insert_many(
+        {
+            "employee_id": f"EMP{i:06d}",
+            "full_name": f"Employee {i}",
+            "email": f"employee{i}@example.com",
+            "department": f"Dept {i % 10}",
+        }
+        for i in range(employees)
+    )
+    start = datetime.combine(date.today(), datetime.min.time())
+    ids = [doc["_id"] for doc in db.employees.find({}, {"_id": 1})]
+    batch = []
+    for n, emp_id in enumerate(ids):
+        for d in range(days):
+            batch.append({
+                "employee": emp_id,
+                "date": start - timedelta(days=d),
+                "status": "Present" if (n + d) % 3 else "Absent",
+            })
+        if len(batch) >= 10000:
+            db.attendance.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        db.attendance.insert_many(batch, ordered=False)
+    Attendance.ensure_indexes()
+
+    # Seed the per-employee counters the way check_attendance_counters --fix would.
+    db.employees.bulk_write([
+        UpdateOne({"_id": emp_id}, {"$set": {"present_count": c["present"], "absent_count": c["absent"]}})
+        for emp_id, c in attendance_counts().items()
+    ])
+
+
+def legacy_list_employees():
+    return [
+        {
+            "id": str(e.id),
+            "employee_id": e.employee_id,
+            "full_name": e.full_name,
+            "email": e.email,
+            "department": e.department,
+            "present_count": Attendance.objects(employee=e.id, status="Present").count(),
+            "absent_count": Attendance.objects(employee=e.id, status="Absent").count()
+        }
+        for e in Employee.objects().order_by("-id")
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--days", type=int, default=20, help="attendance records per employee")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    counter = CommandCounter()
+    factory = APIRequestFactory()
+
+    print(f"{'employees':>10} {'variant':>8} {'round trips':>12} {'best ms':>10}")
+    for size in args.sizes:
+        db = connect_bench_db([counter])
+        seed(db, size, args.days)
+
+        def current():
+            return list_employees(factory.get("/api/employees/")).data
+
+        results = {}
+        for name, func in (("before", legacy_list_employees), ("after", current)):
+            counter.reset()
+            func()
+            trips = counter.count
+            best, results[name] = timed(func, args.repeat)
+            print(f"{size:>10} {name:>8} {trips:>12} {best * 1000:>10.1f}")
+
+        if results["before"] != results["after"]:
+            raise SystemExit(f"Responses differ for {size} employees")
+
+        db.client.drop_database(db.name)
+
+
+if __name__ == "__main__":
+    main()
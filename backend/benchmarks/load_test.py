@@ -0,0 +1,156 @@
+"""
+HTTP load test comparing the WSGI (sync) and ASGI (async) serving modes.
+
+Seeds the benchmark database, then drives each server with the same mix of
+read requests from many concurrent clients and reports throughput and
+latency percentiles. Start both servers against the benchmark database with
+the response cache disabled, so every request reaches MongoDB:
+
+    export MONGO_URI=mongodb://localhost:27017/hrms_bench HRMS_CACHE_BACKEND=none
+    gunicorn config.wsgi:application --workers 4 --bind 127.0.0.1:8001
+    uvicorn config.asgi:application --workers 4 --port 8002
+
+Usage:
+    BENCH_MONGO_URI=mongodb://localhost:27017 python benchmarks/load_test.py \\
+        --server wsgi=http://127.0.0.1:8001 --server asgi=http://127.0.0.1:8002
+    python benchmarks/load_test.py --server ... --concurrency 16 64 256 --duration 20
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+import http.client
+import itertools
+import threading
+import time
+from urllib.parse import urlsplit
+
+from _common import connect_bench_db
+
+from pymongo import UpdateOne
+
+from hrms.aggregations import attendance_counts
+from hrms.models import Attendance
+from hrms.rollups import rebuild_daily_stats
+
+
+def seed(db, employees, days):
+    db.employees.insert_many(
+        {
+            "employee_id": f"EMP{i:06d}",
+            "full_name": f"Employee {i}",
+            "email": f"employee{i}@example.com",
+            "department": f"Dept {i % 10}",
+        }
+        for i in range(employees)
+    )
+    start = datetime.combine(date.today(), datetime.min.time())
+    batch = []
+    for n, doc in enumerate(db.employees.find({}, {"_id": 1})):
+        for d in range(days):
+            batch.append({
+                "employee": doc["_id"],
+                "date": start - timedelta(days=d),
+                "status": "Present" if (n + d) % 3 else "Absent",
+            })
+        if len(batch) >= 10000:
+            db.attendance.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        db.attendance.insert_many(batch, ordered=False)
+    Attendance.ensure_indexes()
+
+    # Bring the rollups and per-employee counters in line with the seed data.
+    rebuild_daily_stats()
+    db.employees.bulk_write([
+        UpdateOne({"_id": emp_id}, {"$set": {"present_count": c["present"], "absent_count": c["absent"]}})
+        for emp_id, c in attendance_counts().items()
+    ])
+
+
+def request_paths(employees):
+    for n in itertools.count():
+        employee_id = f"EMP{n * 7919 % employees:06d}"
+        yield "/api/dashboard/summary/"
+        yield "/api/employees/?limit=100"
+        yield f"/api/attendance/{employee_id}/"
+        yield f"/api/attendance/{employee_id}/?summary=monthly"
+
+
+def run_load(base_url, employees, concurrency, duration):
+    """
+    Issue requests from ``concurrency`` keep-alive clients for ``duration`` seconds.
+
+    Returns:
+        Tuple of (sorted latencies in seconds, number of failed requests)
+    """
+    parts = urlsplit(base_url)
+    paths = request_paths(employees)
+    paths_lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        latencies, failures = [], 0
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+        while time.perf_counter() < deadline:
+            with paths_lock:
+                path = next(paths)
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    failures += 1
+            except (OSError, http.client.HTTPException):
+                failures += 1
+                conn.close()
+                conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+                continue
+            latencies.append(time.perf_counter() - start)
+        conn.close()
+        return latencies, failures
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: client(), range(concurrency)))
+
+    latencies = sorted(itertools.chain.from_iterable(r[0] for r in results))
+    return latencies, sum(r[1] for r in results)
+
+
+def percentile(latencies, pct):
+    if not latencies:
+        return float("nan")
+    return latencies[min(len(latencies) - 1, int(len(latencies) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--server", action="append", required=True, metavar="NAME=URL",
+        help="server to test, e.g. wsgi=http://127.0.0.1:8001 (repeatable)"
+    )
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=365, help="attendance records per employee")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--duration", type=float, default=15, help="seconds per run")
+    parser.add_argument("--no-seed", action="store_true", help="reuse the existing benchmark data")
+    args = parser.parse_args()
+
+    servers = [s.split("=", 1) for s in args.server]
+    if not args.no_seed:
+        db = connect_bench_db()
+        seed(db, args.employees, args.days)
+
+    print(f"{'server':>8} {'clients':>8} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'failed':>7}")
+    for concurrency in args.concurrency:
+        for name, url in servers:
+            latencies, failures = run_load(url, args.employees, concurrency, args.duration)
+            print(
+                f"{name:>8} {concurrency:>8} {len(latencies) / args.duration:>9.1f} "
+                f"{percentile(latencies, 50) * 1000:>8.1f} {percentile(latencies, 95) * 1000:>8.1f} "
+                f"{percentile(latencies, 99) * 1000:>8.1f} {failures:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
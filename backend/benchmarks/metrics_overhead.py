@@ -0,0 +1,80 @@
+"""
+Overhead of the Prometheus instrumentation per request.
+
+Calls a trivial view with and without metrics_middleware, and feeds synthetic
+command events through the MongoDB command listener, then reports the added
+cost in microseconds. No MongoDB is needed. Run it once as is and once with
+``PROMETHEUS_MULTIPROC_DIR`` pointing at an empty directory to measure the
+multiprocess (gunicorn) mode, which writes every update to a memory-mapped file.
+
+Usage:
+    python benchmarks/metrics_overhead.py
+    PROMETHEUS_MULTIPROC_DIR=$(mktemp -d) python benchmarks/metrics_overhead.py --requests 200000
+"""
+import argparse
+import os
+import time
+from types import SimpleNamespace
+
+import _common  # noqa: F401  (configures Django)
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve
+
+from hrms.metrics import MongoCommandMetrics
+from hrms.middleware import metrics_middleware
+
+BUDGET_US = 50
+
+
+def view(request):
+    return HttpResponse("ok")
+
+
+def per_call_us(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100000)
+    args = parser.parse_args()
+
+    mode = "multiprocess" if os.getenv("PROMETHEUS_MULTIPROC_DIR") else "single process"
+    request = RequestFactory().get("/api/employees/")
+    request.resolver_match = resolve("/api/employees/")
+    instrumented = metrics_middleware(view)
+
+    bare = min(per_call_us(lambda: view(request), args.requests) for _ in range(3))
+    with_metrics = min(per_call_us(lambda: instrumented(request), args.requests) for _ in range(3))
+    overhead = with_metrics - bare
+
+    listener = MongoCommandMetrics()
+    started = SimpleNamespace(
+        command_name="find", command={"find": "employees"}, connection_id=("localhost", 27017), request_id=1
+    )
+    succeeded = SimpleNamespace(
+        command_name="find", connection_id=("localhost", 27017), request_id=1, duration_micros=800
+    )
+
+    def command():
+        listener.started(started)
+        listener.succeeded(succeeded)
+
+    per_command = min(per_call_us(command, args.requests) for _ in range(3))
+
+    print(f"mode: {mode}")
+    print(f"view alone:            {bare:.2f} us")
+    print(f"with metrics:          {with_metrics:.2f} us")
+    print(f"request overhead:      {overhead:.2f} us (budget {BUDGET_US} us)")
+    print(f"per MongoDB command:   {per_command:.2f} us")
+    if overhead > BUDGET_US:
+        raise SystemExit("Metrics overhead is over budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Per-row cost of building the list_employees and employee_attendance rows.
+
+"hydrated" replays the previous implementation, which loaded mongoengine
+documents and copied their fields into dicts; "raw" calls the current
+payload builders, which read projected documents with ``as_pymongo()``. For
+each size the script reports CPU time and peak traced allocations per row and
+checks that both produce the same JSON.
+
+Usage:
+    BENCH_MONGO_URI=mongodb://localhost:27017 python benchmarks/row_building.py
+    python benchmarks/row_building.py --sizes 10000 100000
+"""
+import argparse
+from datetime import datetime, timedelta
+import json
+import time
+import tracemalloc
+
+from _common import connect_bench_db
+
+from hrms.models import Attendance, Employee
+from hrms.views import EMPLOYEE_LIST_FIELDS, _employee_attendance_payload, _employee_list_payload
+
+
+def seed(db, rows):
+    db.employees.insert_many(
+        {
+            "employee_id": f"EMP{i:06d}",
+            "full_name": f"Employee {i}",
+            "email": f"employee{i}@example.com",
+            "department": f"Dept {i % 10}",
+            "present_count": i % 200,
+            "absent_count": i % 50,
+        }
+        for i in range(rows)
+    )
+    emp = db.employees.find_one({"employee_id": "EMP000000"})
+    start = datetime(2000, 1, 1)
+    db.attendance.insert_many(
+        {"employee": emp["_id"], "date": start + timedelta(days=d), "status": "Present" if d % 3 else "Absent"}
+        for d in range(rows)
+    )
+    Employee.ensure_indexes()
+    Attendance.ensure_indexes()
+
+
+def hydrated_employee_list():
+    data = []
+    for e in Employee.objects().order_by("-id").only(*EMPLOYEE_LIST_FIELDS):
+        data.append({
+            "id": str(e.id),
+            "employee_id": e.employee_id,
+            "full_name": e.full_name,
+            "email": e.email,
+            "department": e.department,
+            "present_count": e.present_count,
+            "absent_count": e.absent_count
+        })
+    return data
+
+
+def hydrated_attendance():
+    emp = Employee.objects(employee_id="EMP000000").first()
+    records = (
+        Attendance.objects(employee=emp)
+        .only("date", "status")
+        .order_by("-date")
+    )
+    return {
+        "employee": {
+            "employee_id": emp.employee_id,
+            "full_name": emp.full_name,
+            "department": emp.department,
+        },
+        "present_days": emp.present_count,
+        "absent_days": emp.absent_count,
+        "records": [{"id": str(r.id), "date": str(r.date), "status": r.status} for r in records]
+    }
+
+
+def measure(func, rows):
+    """Return (result, CPU microseconds per row, peak KiB allocated per 1000 rows)."""
+    start = time.process_time()
+    result = func()
+    cpu = time.process_time() - start
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, cpu / rows * 1_000_000, peak / rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'read':<22}{'rows':>8}{'variant':>10}{'cpu/row':>12}{'peak/row':>12}")
+    for rows in args.sizes:
+        db = connect_bench_db()
+        seed(db, rows)
+        cases = [
+            ("list_employees", hydrated_employee_list,
+             lambda: _employee_list_payload(EMPLOYEE_LIST_FIELDS, None, None)),
+            ("employee_attendance", hydrated_attendance,
+             lambda: _employee_attendance_payload("EMP000000")),
+        ]
+        for name, hydrated, raw in cases:
+            results = []
+            for variant, func in (("hydrated", hydrated), ("raw", raw)):
+                result, cpu, peak = measure(func, rows)
+                results.append(result)
+                print(f"{name:<22}{rows:>8}{variant:>10}{cpu:>9.2f} us{peak:>10.0f} B")
+            if json.dumps(results[0]) != json.dumps(results[1]):
+                raise SystemExit(f"{name}: hydrated and raw rows differ")
+        db.client.drop_database(db.name)
+
+
+if __name__ == "__main__":
+    main()
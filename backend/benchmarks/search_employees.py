@@ -0,0 +1,137 @@
+"""
+Latency benchmark for GET /api/employees/search/.
+
+Seeds N employees, then calls the ``search_employees`` view with random
+one- to twelve-character prefixes of names, IDs and emails (with and without a
+department filter) and reports latency percentiles. The winning plan and the
+keys examined of each query kind are printed from ``explain()`` to confirm it
+walks the search_prefixes index in ``_id`` order, without an in-memory SORT.
+
+Usage:
+    BENCH_MONGO_URI=mongodb://localhost:27017 python benchmarks/search_employees.py
+    python benchmarks/search_employees.py --employees 100000 --queries 2000
+"""
+import argparse
+import random
+import re
+import string
+import time
+
+from _common import connect_bench_db
+
+from rest_framework.test import APIRequestFactory
+
+from hrms.models import SEARCH_PREFIX_LENGTH, Employee, employee_search_prefixes, employee_search_terms
+from hrms.views import search_employees
+
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "Priya", "Wei"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Sharma", "Chen"]
+DEPARTMENTS = ["Engineering", "Human Resources", "Finance", "Sales", "Marketing", "Support"]
+
+
+def seed(db, employees):
+    rng = random.Random(42)
+    batch = []
+    for i in range(employees):
+        doc = {
+            "employee_id": f"EMP{i:06d}",
+            "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}{rng.choice(string.ascii_lowercase)}",
+            "email": f"employee{i}@example.com",
+            "department": rng.choice(DEPARTMENTS),
+            "present_count": 0,
+            "absent_count": 0,
+        }
+        doc["search_terms"] = employee_search_terms(
+            doc["employee_id"], doc["full_name"], doc["email"], doc["department"]
+        )
+        doc["search_prefixes"] = employee_search_prefixes(doc["search_terms"])
+        batch.append(doc)
+        if len(batch) >= 10000:
+            db.employees.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        db.employees.insert_many(batch, ordered=False)
+    Employee.ensure_indexes()
+
+
+def random_queries(count, employees):
+    rng = random.Random(7)
+    for _ in range(count):
+        source = rng.choice([
+            rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES),
+            f"EMP{rng.randrange(employees):06d}", f"employee{rng.randrange(employees)}",
+        ])
+        params = {"q": source[:rng.randint(1, 12)]}
+        if rng.random() < 0.3:
+            params["department"] = rng.choice(DEPARTMENTS)
+        yield params
+
+
+def explain(params):
+    q = params["q"].casefold()
+    query = {"search_prefixes": q[:SEARCH_PREFIX_LENGTH]}
+    if len(q) > SEARCH_PREFIX_LENGTH:
+        query["search_terms"] = {"$regex": f"^{re.escape(q)}"}
+    if "department" in params:
+        query["department"] = params["department"]
+    return Employee._get_collection().find(query).sort("_id", -1).limit(21).explain()
+
+
+def stage_names(plan):
+    yield plan["stage"]
+    for key in ("inputStage", "inputStages"):
+        stages = plan.get(key, [])
+        for stage in stages if isinstance(stages, list) else [stages]:
+            yield from stage_names(stage)
+
+
+def index_names(plan):
+    if "indexName" in plan:
+        yield plan["indexName"]
+    for key in ("inputStage", "inputStages"):
+        stages = plan.get(key, [])
+        for stage in stages if isinstance(stages, list) else [stages]:
+            yield from index_names(stage)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    db = connect_bench_db()
+    seed(db, args.employees)
+    factory = APIRequestFactory()
+
+    for params in (
+        {"q": "j"}, {"q": "smith"}, {"q": "emp0001"}, {"q": "employee12345"}, {"q": "s", "department": "Sales"}
+    ):
+        result = explain(params)
+        plan = result["queryPlanner"]["winningPlan"]
+        plan = plan.get("queryPlan", plan)
+        stages = list(stage_names(plan))
+        print(
+            f"{params}: {', '.join(index_names(plan)) or 'COLLSCAN'}"
+            f"{' + in-memory SORT' if 'SORT' in stages else ''}, "
+            f"{result['executionStats']['totalKeysExamined']} keys examined"
+        )
+
+    latencies = []
+    for params in random_queries(args.queries, args.employees):
+        start = time.perf_counter()
+        response = search_employees(factory.get("/api/employees/search/", params))
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            raise SystemExit(f"{params} returned {response.status_code}")
+
+    latencies.sort()
+    for pct in (50, 95, 99):
+        value = latencies[min(len(latencies) - 1, int(len(latencies) * pct / 100))]
+        print(f"p{pct}: {value * 1000:.2f} ms")
+
+    db.client.drop_database(db.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Cold start and per-request overhead of config.settings vs config.settings_api.
+
+Each profile runs in fresh interpreters: the cold start is the time to set up
+Django and import the WSGI application, and the per-request cost is measured
+on ``GET /healthz/live``, which never queries MongoDB, so the difference is
+the middleware and app stack. Workers connect to ``BENCH_MONGO_URI`` (or
+``MONGO_URI``) as usual before the timed requests.
+
+Usage:
+    BENCH_MONGO_URI=mongodb://localhost:27017 python benchmarks/settings_profiles.py
+    python benchmarks/settings_profiles.py --starts 10 --requests 20000
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+PROFILES = ("config.settings", "config.settings_api")
+
+
+def child(settings_module, requests):
+    start = time.perf_counter()
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.environ["DJANGO_SETTINGS_MODULE"] = settings_module
+    from config.wsgi import application  # noqa: F401
+    cold_start = time.perf_counter() - start
+
+    from django.test import Client
+
+    client = Client()
+    client.get("/healthz/live")  # connects to MongoDB
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.get("/healthz/live")
+    per_request = (time.perf_counter() - start) / requests
+    if response.status_code != 200:
+        raise SystemExit(f"/healthz/live returned {response.status_code}")
+    print(json.dumps({"cold_start": cold_start, "per_request": per_request, "modules": len(sys.modules)}))
+
+
+def run_profile(settings_module, starts, requests):
+    env = {
+        **os.environ,
+        "MONGO_URI": os.getenv("BENCH_MONGO_URI") or os.getenv("MONGO_URI"),
+        "HRMS_ENSURE_INDEXES": "False",
+    }
+    results = []
+    for i in range(starts):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", settings_module, "--requests", str(requests if i == 0 else 1)],
+            env=env, check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        "cold_start": statistics.median(r["cold_start"] for r in results),
+        "per_request": results[0]["per_request"],
+        "modules": results[0]["modules"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--starts", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--child")
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.requests)
+        return
+    if not (os.getenv("BENCH_MONGO_URI") or os.getenv("MONGO_URI")):
+        raise SystemExit("Set BENCH_MONGO_URI or MONGO_URI to run the benchmarks.")
+
+    print(f"{'profile':<22}{'cold start':>12}{'per request':>14}{'modules':>9}")
+    for settings_module in PROFILES:
+        result = run_profile(settings_module, args.starts, args.requests)
+        print(
+            f"{settings_module:<22}{result['cold_start'] * 1000:>9.1f} ms"
+            f"{result['per_request'] * 1_000_000:>11.1f} us{result['modules']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
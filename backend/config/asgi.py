@@ -3,6 +3,10 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Run with an ASGI server, e.g. ``uvicorn config.asgi:application``. The read
+endpoints are served by the async views in ``hrms.async_views`` and MongoDB
+connections are opened by the lifespan startup.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
@@ -12,5 +16,10 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault('HRMS_ASYNC_VIEWS', 'True')
+
+django_application = get_asgi_application()
+
+from hrms.lifespan import MongoLifespan
 
-application = get_asgi_application()
+application = MongoLifespan(django_application)
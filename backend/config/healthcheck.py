@@ -1,4 +1,23 @@
 from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from hrms.health import check_readiness
 
 def home(request):
-    return JsonResponse({"message": "HRMS Lite healthcheck done. ✅"})
\ No newline at end of file
+    return JsonResponse({"message": "HRMS Lite healthcheck done. ✅"})
+
+
+@require_GET
+def live(request):
+    """Liveness: the process serves requests. Never touches MongoDB."""
+    return JsonResponse({"status": "alive"})
+
+
+@require_GET
+def ready(request):
+    """Readiness: MongoDB answers a ping in time and the pool has a free connection."""
+    report = check_readiness()
+    return JsonResponse(
+        {"status": "ready" if report["ready"] else "not ready", **report},
+        status=200 if report["ready"] else 503
+    )
@@ -48,6 +48,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "hrms.middleware.metrics_middleware",
+    "hrms.middleware.mongo_connection_middleware",
+    "hrms.middleware.query_instrumentation_middleware",
+    "hrms.middleware.compression_middleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -59,7 +63,16 @@ MIDDLEWARE = [
 ]
 
 
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        # orjson-backed, same output as rest_framework.renderers.JSONRenderer
+        "hrms.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+}
+
 CORS_ALLOW_ALL_ORIGINS = True
+CORS_EXPOSE_HEADERS = ["ETag", "Last-Modified", "Server-Timing"]
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -94,6 +107,88 @@ DATABASES = {
 }
 
 
+# Cache
+# The "django" HRMS cache backend stores payloads in CACHES[ALIAS]; point
+# REDIS_URL at a shared Redis (requires the redis package) so every gunicorn
+# worker sees the same entries and invalidations.
+
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+HRMS_CACHE = {
+    # "local" (per-process LRU), "django" (CACHES[ALIAS]) or "none"
+    "BACKEND": os.getenv("HRMS_CACHE_BACKEND", "django" if os.getenv("REDIS_URL") else "local"),
+    "ALIAS": "default",
+    "MAX_ENTRIES": int(os.getenv("HRMS_CACHE_MAX_ENTRIES", "1024")),
+    "TTL": int(os.getenv("HRMS_CACHE_TTL", "30")),
+}
+
+def env_int(name, default=None):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+# MongoDB client options, passed to every client hrms.mongo creates. Unset
+# values keep the PyMongo defaults (maxPoolSize 100, no wait queue timeout,
+# 30s server selection, no socket timeout).
+MONGO_CLIENT_OPTIONS = {
+    "maxPoolSize": env_int("MONGO_MAX_POOL_SIZE"),
+    "minPoolSize": env_int("MONGO_MIN_POOL_SIZE"),
+    "maxIdleTimeMS": env_int("MONGO_MAX_IDLE_TIME_MS"),
+    "waitQueueTimeoutMS": env_int("MONGO_WAIT_QUEUE_TIMEOUT_MS"),
+    "serverSelectionTimeoutMS": env_int("MONGO_SERVER_SELECTION_TIMEOUT_MS"),
+    "connectTimeoutMS": env_int("MONGO_CONNECT_TIMEOUT_MS"),
+    "socketTimeoutMS": env_int("MONGO_SOCKET_TIMEOUT_MS"),
+}
+# Connections to open when a worker boots (default: minPoolSize, at least 1).
+MONGO_WARM_CONNECTIONS = env_int("MONGO_WARM_CONNECTIONS")
+# Time limit of the MongoDB work a worker does while it boots, kept well below
+# gunicorn's worker timeout; index builds and seeding continue in the background.
+MONGO_BOOT_TIMEOUT_MS = env_int("MONGO_BOOT_TIMEOUT_MS", 5000)
+# Commands slower than this are logged by hrms.monitoring.
+MONGO_SLOW_COMMAND_MS = env_int("MONGO_SLOW_COMMAND_MS", 100)
+
+# Build missing MongoDB indexes in a background thread when a worker connects.
+# Turn off when indexes are managed with `manage.py ensure_indexes` instead.
+HRMS_ENSURE_INDEXES = os.getenv("HRMS_ENSURE_INDEXES", "True") == "True"
+
+# Serve the read endpoints with the Motor-backed async views. config/asgi.py
+# turns this on; the views need the event loop an ASGI server provides.
+HRMS_ASYNC_VIEWS = os.getenv("HRMS_ASYNC_VIEWS", "False") == "True"
+
+# Most MongoDB commands a request may issue before it is reported (unset: no
+# limit). HRMS_QUERY_BUDGET_ACTION is "log" or "raise"; tests use "raise" so
+# an N+1 regression fails them.
+HRMS_QUERY_BUDGET = env_int("HRMS_QUERY_BUDGET")
+HRMS_QUERY_BUDGET_ACTION = os.getenv("HRMS_QUERY_BUDGET_ACTION", "log")
+
+# employee_id -> ObjectId cache used by the attendance write paths
+# (hrms.resolver). A TTL of 0 disables it.
+HRMS_EMPLOYEE_RESOLVER_MAX_ENTRIES = env_int("HRMS_EMPLOYEE_RESOLVER_MAX_ENTRIES", 10000)
+HRMS_EMPLOYEE_RESOLVER_TTL = env_int("HRMS_EMPLOYEE_RESOLVER_TTL", 30)
+
+# Response compression: bodies smaller than HRMS_COMPRESSION_MIN_SIZE bytes
+# are sent as is. Brotli is used when the brotli package is installed.
+HRMS_COMPRESSION_MIN_SIZE = env_int("HRMS_COMPRESSION_MIN_SIZE", 1024)
+HRMS_GZIP_LEVEL = env_int("HRMS_GZIP_LEVEL", 6)
+HRMS_BROTLI_QUALITY = env_int("HRMS_BROTLI_QUALITY", 4)
+
+# /healthz/ready: MongoDB ping timeout and how long a result is reused.
+HRMS_HEALTH_PING_TIMEOUT_MS = env_int("HRMS_HEALTH_PING_TIMEOUT_MS", 500)
+HRMS_HEALTH_CACHE_SECONDS = float(os.getenv("HRMS_HEALTH_CACHE_SECONDS", "2"))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
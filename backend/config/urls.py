@@ -14,11 +14,20 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path,include
-from .healthcheck import home
+from .healthcheck import home, live, ready
+from hrms.views import metrics
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path("", home),
+    path("healthz/live", live),
+    path("healthz/ready", ready),
+    path("metrics", metrics),
     path("api/", include("hrms.urls"))
 ]
+
+# Not installed in the API-only profile (config/settings_api.py).
+if apps.is_installed("django.contrib.admin"):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
@@ -13,7 +13,8 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-from hrms.mongo import connect_mongo
-connect_mongo()
-
+# MongoDB is not connected here: with gunicorn --preload this module is
+# imported by the master, and a MongoClient must not cross a fork. Workers
+# connect in post_worker_init (gunicorn.conf.py) or on their first request
+# (hrms.middleware).
 application = get_wsgi_application()
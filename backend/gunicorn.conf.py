@@ -0,0 +1,37 @@
+"""
+Gunicorn settings for the HRMS API, picked up from the working directory.
+
+The app is preloaded in the master so workers fork with Django already
+imported and share its memory copy-on-write. The master never connects to
+MongoDB; each worker opens (and warms up) its own client once it has
+initialized the app, since a MongoClient must not be shared across a fork.
+
+With ``PROMETHEUS_MULTIPROC_DIR`` set, workers share their Prometheus metrics
+through files in that directory (see hrms.metrics); the master empties it at
+start and drops the live gauges of workers that exit.
+"""
+import glob
+import os
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "True") == "True"
+
+
+def on_starting(server):
+    metrics_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        os.makedirs(metrics_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(metrics_dir, "*.db")):
+            os.remove(path)
+
+
+def post_worker_init(worker):
+    from hrms.mongo import ensure_connected
+
+    ensure_connected()
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,92 @@
+"""
+Aggregation helpers for attendance statistics.
+"""
+from .models import Attendance, mongo_date
+
+
+def attendance_counts_pipeline(employee_ids=None):
+    """Build the ``$group`` pipeline behind attendance_counts()."""
+    pipeline = []
+    if employee_ids is not None:
+        pipeline.append({"$match": {"employee": {"$in": list(employee_ids)}}})
+    # Sorting on the group key lets the planner read the (employee, status)
+    # index alone (a covered scan) instead of every attendance document.
+    pipeline.append({"$sort": {"employee": 1}})
+    pipeline.append({
+        "$group": {
+            "_id": "$employee",
+            "present": {"$sum": {"$cond": [{"$eq": ["$status", "Present"]}, 1, 0]}},
+            "absent": {"$sum": {"$cond": [{"$eq": ["$status", "Absent"]}, 1, 0]}},
+        }
+    })
+    return pipeline
+
+
+def attendance_counts(employee_ids=None):
+    """
+    Count Present/Absent attendance records per employee in a single aggregation.
+
+    Args:
+        employee_ids: Optional iterable of Employee ObjectIds to restrict the
+            count to. When omitted, every attendance record is counted.
+
+    Returns:
+        Dictionary mapping employee ObjectId to a
+        ``{"present": int, "absent": int}`` dictionary. Employees without any
+        attendance records are not included.
+    """
+    return {
+        row["_id"]: {"present": row["present"], "absent": row["absent"]}
+        for row in Attendance.objects.aggregate(attendance_counts_pipeline(employee_ids))
+    }
+
+
+def monthly_attendance_pipeline(employee_oid, start=None, end=None):
+    """
+    Build the ``$match``/``$group`` pipeline behind monthly_attendance().
+
+    The ``$match`` on employee and date is served by the ``(employee, date)``
+    index, so only the requested range is read.
+    """
+    match = {"employee": employee_oid}
+    date_range = {}
+    if start:
+        date_range["$gte"] = mongo_date(start)
+    if end:
+        date_range["$lte"] = mongo_date(end)
+    if date_range:
+        match["date"] = date_range
+
+    return [
+        {"$match": match},
+        {
+            "$group": {
+                "_id": {"$dateToString": {"format": "%Y-%m", "date": "$date"}},
+                "present": {"$sum": {"$cond": [{"$eq": ["$status", "Present"]}, 1, 0]}},
+                "absent": {"$sum": {"$cond": [{"$eq": ["$status", "Absent"]}, 1, 0]}},
+            }
+        },
+        {"$sort": {"_id": -1}},
+    ]
+
+
+def monthly_rows(rows):
+    """Format monthly_attendance_pipeline() output rows for a response."""
+    return [{"month": row["_id"], "present": row["present"], "absent": row["absent"]} for row in rows]
+
+
+def monthly_attendance(employee_oid, start=None, end=None):
+    """
+    Break one employee's attendance down into Present/Absent counts per month.
+
+    Args:
+        employee_oid: ObjectId of the Employee
+        start: Optional first date to include
+        end: Optional last date to include
+
+    Returns:
+        List of ``{"month": "YYYY-MM", "present": int, "absent": int}``
+        dictionaries, newest month first. Months without records are omitted.
+    """
+    pipeline = monthly_attendance_pipeline(employee_oid, start, end)
+    return monthly_rows(Attendance.objects.aggregate(pipeline))
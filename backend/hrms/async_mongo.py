@@ -0,0 +1,73 @@
+"""
+Motor (asyncio MongoDB driver) connection for the async read views.
+
+The client is created by the ASGI lifespan startup (see hrms.lifespan) so it is
+bound to the server's event loop, and closed on shutdown. mongoengine keeps
+serving the synchronous write views alongside it.
+"""
+import asyncio
+import os
+import logging
+
+from .mongo import boot_timeout, client_options, warm_connection_count
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_database = None
+
+
+def connect_async_mongo():
+    """
+    Create the Motor client for MONGO_URI on the running event loop.
+
+    Raises:
+        ValueError: If MONGO_URI environment variable is not set
+        ImportError: If the motor package is not installed
+    """
+    global _client, _database
+    if _client is not None:
+        return _database
+
+    mongo_uri = os.getenv("MONGO_URI")
+    if not mongo_uri:
+        error_msg = "MONGO_URI environment variable is not set"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    _client = AsyncIOMotorClient(mongo_uri, **client_options("async"))
+    # Same database mongoengine picks for a URI without one.
+    _database = _client.get_default_database(default="test")
+    logger.info("Created async MongoDB client")
+    return _database
+
+
+async def warm_up_async_mongo():
+    """
+    Open the Motor client's pooled connections before the first request,
+    giving up after MONGO_BOOT_TIMEOUT_MS.
+    """
+    connections = warm_connection_count()
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(_client.admin.command("ping") for _ in range(connections))),
+            boot_timeout()
+        )
+        logger.info(f"Warmed up {connections} async MongoDB connection(s)")
+    except Exception as e:
+        logger.warning(f"Async MongoDB warm-up failed, connecting on first use: {str(e)}")
+
+
+def close_async_mongo():
+    global _client, _database
+    if _client is not None:
+        _client.close()
+        _client = _database = None
+        logger.info("Closed async MongoDB client")
+
+
+def get_async_db():
+    """Return the Motor database, connecting on first use."""
+    return _database if _database is not None else connect_async_mongo()
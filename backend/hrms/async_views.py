@@ -0,0 +1,327 @@
+"""
+Async versions of the read endpoints, served under ASGI.
+
+These views read through Motor (hrms.async_mongo) instead of mongoengine, so a
+slow query suspends the request instead of blocking a worker, and independent
+reads run concurrently with ``asyncio.gather``. They share query parameter
+parsing, cache namespaces and ETags with the synchronous views in
+hrms.views and return identical JSON. Write endpoints stay synchronous; Django
+runs them in a thread pool under ASGI.
+"""
+import asyncio
+from datetime import date as today_date
+import logging
+
+from bson import ObjectId
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from pymongo.errors import ConnectionFailure
+from rest_framework import status
+
+from .aggregations import monthly_attendance_pipeline, monthly_rows
+from .async_mongo import get_async_db
+from .cache import get_response_cache
+from .conditional import (
+    aemployee_attendance_etag, aemployee_attendance_last_modified, aemployee_version,
+    aemployees_version, alist_employees_etag, alist_employees_last_modified,
+    async_conditional_get, version_tag
+)
+from .exceptions import ValidationException
+from .exports import EXPORT_FORMATS, aexport_rows, astream_export
+from .renderers import json_response
+from .models import Attendance, Counter, DailyAttendanceStats, Employee, mongo_date
+from .rollups import EMPLOYEE_COUNTER
+from .views import (
+    ATTENDANCE_EMPLOYEE_FIELDS, EXPORT_BATCH_SIZE, _attendance_payload_base, _attendance_row,
+    _date_range_filters, _employee_row, _export_disposition, _parse_attendance_filters,
+    _parse_employee_list_params, _parse_export_params
+)
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_METHODS = ("GET", "HEAD")
+DATE_RANGE_OPERATORS = {"date__gte": "$gte", "date__lte": "$lte"}
+
+
+def error_response(message, error_code, status_code):
+    return JsonResponse({
+        "error": error_code,
+        "message": message
+    }, status=status_code)
+
+
+def _collection(document):
+    return get_async_db()[document._meta["collection"]]
+
+
+# ------------------ Employees ------------------
+
+async def _employee_list_payload(fields, after, limit):
+    query = {"_id": {"$lt": ObjectId(after)}} if after is not None else {}
+    projection = {f: 1 for f in fields if f != "id"}
+    cursor = _collection(Employee).find(query, projection or {"_id": 1}).sort("_id", -1)
+
+    next_cursor = None
+    if limit is not None:
+        employees = await cursor.limit(limit + 1).to_list(length=None)
+        if len(employees) > limit:
+            employees = employees[:limit]
+            next_cursor = str(employees[-1]["_id"])
+    else:
+        employees = await cursor.to_list(length=None)
+
+    data = [_employee_row(e, fields) for e in employees]
+
+    if limit is not None:
+        return {"results": data, "next": next_cursor}
+    return data
+
+
+@async_conditional_get(alist_employees_etag, alist_employees_last_modified)
+async def list_employees(request):
+    """Async list_employees; see hrms.views.list_employees for the parameters."""
+    if request.method not in ALLOWED_METHODS:
+        return HttpResponseNotAllowed(ALLOWED_METHODS)
+    try:
+        try:
+            fields, after, limit = _parse_employee_list_params(request.GET)
+        except ValidationException as e:
+            logger.warning(f"Invalid employee list parameters: {e.message}")
+            return error_response(e.message, e.error_code, e.status_code)
+
+        payload = await get_response_cache().aget_or_set(
+            "list_employees",
+            f"{version_tag(await aemployees_version(request))}:{request.GET.urlencode()}",
+            ("employees",),
+            lambda: _employee_list_payload(fields, after, limit)
+        )
+        data = payload["results"] if limit is not None else payload
+
+        logger.info(f"Retrieved {len(data)} employees")
+        return json_response(payload)
+    except ConnectionFailure as e:
+        logger.error(f"Database connection error: {str(e)}")
+        return error_response(
+            "Database connection error",
+            "DB_CONNECTION_ERROR",
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    except Exception as e:
+        logger.error(f"Error retrieving employees: {str(e)}")
+        return error_response(
+            "Error retrieving employees",
+            "DB_ERROR",
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+# ------------------ Attendance ------------------
+
+async def _employee_attendance_payload(employee_id, start=None, end=None, summary=None):
+    emp = await _collection(Employee).find_one(
+        {"employee_id": employee_id},
+        {f: 1 for f in ATTENDANCE_EMPLOYEE_FIELDS}
+    )
+    if not emp:
+        return None
+
+    query = {"employee": emp["_id"]}
+    date_range = {
+        DATE_RANGE_OPERATORS[name]: mongo_date(value)
+        for name, value in _date_range_filters(start, end).items()
+    }
+    if date_range:
+        query["date"] = date_range
+    records_cursor = (
+        _collection(Attendance)
+        .find(query, {"date": 1, "status": 1})
+        .sort("date", -1)
+    )
+
+    # The records and the monthly breakdown are independent reads.
+    reads = [records_cursor.to_list(length=None)]
+    if summary == "monthly":
+        pipeline = monthly_attendance_pipeline(emp["_id"], start, end)
+        reads.append(_collection(Attendance).aggregate(pipeline).to_list(length=None))
+    results = await asyncio.gather(*reads)
+
+    data = [_attendance_row(r) for r in results[0]]
+
+    payload = _attendance_payload_base(emp, data)
+    if start or end:
+        payload["from"] = str(start) if start else None
+        payload["to"] = str(end) if end else None
+        payload["present_days"] = sum(1 for r in data if r["status"] == "Present")
+        payload["absent_days"] = len(data) - payload["present_days"]
+    if summary == "monthly":
+        payload["monthly"] = monthly_rows(results[1])
+    return payload
+
+
+@async_conditional_get(aemployee_attendance_etag, aemployee_attendance_last_modified)
+async def employee_attendance(request, employee_id):
+    """Async employee_attendance; see hrms.views.employee_attendance."""
+    if request.method not in ALLOWED_METHODS:
+        return HttpResponseNotAllowed(ALLOWED_METHODS)
+    try:
+        start, end, summary = _parse_attendance_filters(request.GET)
+    except ValidationException as e:
+        logger.warning(f"Invalid attendance query parameters: {e.message}")
+        return error_response(e.message, e.error_code, e.status_code)
+
+    try:
+        payload = await get_response_cache().aget_or_set(
+            "employee_attendance",
+            f"{version_tag(await aemployee_version(request, employee_id))}:{employee_id}:{start}:{end}:{summary}",
+            ("attendance", f"employee:{employee_id}"),
+            lambda: _employee_attendance_payload(employee_id, start, end, summary)
+        )
+    except ConnectionFailure as e:
+        logger.error(f"Database connection error: {str(e)}")
+        return error_response(
+            "Database connection error",
+            "DB_CONNECTION_ERROR",
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    except Exception as e:
+        logger.error(f"Error retrieving attendance for {employee_id}: {str(e)}")
+        return error_response(
+            "Error retrieving attendance records",
+            "DB_ERROR",
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    if payload is None:
+        logger.warning(f"Employee not found: {employee_id}")
+        return error_response(
+            f"Employee with ID '{employee_id}' not found",
+            "NOT_FOUND",
+            status.HTTP_404_NOT_FOUND
+        )
+
+    logger.info(f"Retrieved attendance records for {employee_id}")
+    return json_response(payload)
+
+
+# ------------------ Attendance export ------------------
+
+async def export_attendance(request, employee_id=None):
+    """
+    Async export_attendance; see hrms.views.export_attendance.
+
+    The response iterates the Motor cursor asynchronously, so under ASGI each
+    chunk is sent while the following batches are still being read. Django
+    would otherwise consume a synchronous streaming response in full before
+    sending its first byte.
+    """
+    if request.method not in ALLOWED_METHODS:
+        return HttpResponseNotAllowed(ALLOWED_METHODS)
+    try:
+        export_format, start, end = _parse_export_params(request.GET)
+    except ValidationException as e:
+        logger.warning(f"Invalid attendance export parameters: {e.message}")
+        return error_response(e.message, e.error_code, e.status_code)
+
+    query = {}
+    date_range = {
+        DATE_RANGE_OPERATORS[name]: mongo_date(value)
+        for name, value in _date_range_filters(start, end).items()
+    }
+    if date_range:
+        query["date"] = date_range
+
+    try:
+        if employee_id is not None:
+            emp = await _collection(Employee).find_one({"employee_id": employee_id}, {"_id": 1})
+            if not emp:
+                logger.warning(f"Employee not found: {employee_id}")
+                return error_response(
+                    f"Employee with ID '{employee_id}' not found",
+                    "NOT_FOUND",
+                    status.HTTP_404_NOT_FOUND
+                )
+            query["employee"] = emp["_id"]
+            employee_ids = {emp["_id"]: employee_id}
+            sort = [("date", -1)]
+        else:
+            employee_ids = {
+                doc["_id"]: doc["employee_id"]
+                async for doc in _collection(Employee).find({}, {"employee_id": 1})
+            }
+            # Walks the (employee, date) index backwards instead of sorting in memory.
+            sort = [("employee", -1), ("date", -1)]
+    except ConnectionFailure as e:
+        logger.error(f"Database connection error: {str(e)}")
+        return error_response(
+            "Database connection error",
+            "DB_CONNECTION_ERROR",
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error in export_attendance: {str(e)}")
+        return error_response(
+            "An unexpected error occurred",
+            "INTERNAL_ERROR",
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    documents = _collection(Attendance).find(query).sort(sort).batch_size(EXPORT_BATCH_SIZE)
+    response = StreamingHttpResponse(
+        astream_export(export_format, aexport_rows(documents, employee_ids)),
+        content_type=EXPORT_FORMATS[export_format]
+    )
+    response["Content-Disposition"] = _export_disposition(employee_id, export_format)
+    logger.info(f"Streaming {export_format} attendance export for {employee_id or 'all employees'}")
+    return response
+
+
+# ------------------ Dashboard ------------------
+
+async def _employee_total():
+    counters = _collection(Counter)
+    counter = await counters.find_one({"_id": EMPLOYEE_COUNTER}, {"value": 1})
+    if counter is not None and "value" in counter:
+        return counter["value"]
+    # Not seeded yet, see hrms.rollups.seed_employee_total().
+    return await _collection(Employee).count_documents({})
+
+
+async def _dashboard_payload(today):
+    total_employees, stats = await asyncio.gather(
+        _employee_total(),
+        _collection(DailyAttendanceStats).find_one({"_id": mongo_date(today)})
+    )
+    present_today = stats.get("present", 0) if stats else 0
+    absent_today = stats.get("absent", 0) if stats else 0
+
+    marked_today = present_today + absent_today
+    not_marked_today = max(total_employees - marked_today, 0)
+
+    return {
+        "date": str(today),
+        "total_employees": total_employees,
+        "present_today": present_today,
+        "absent_today": absent_today,
+        "not_marked_today": not_marked_today
+    }
+
+
+async def dashboard_summary(request):
+    if request.method not in ALLOWED_METHODS:
+        return HttpResponseNotAllowed(ALLOWED_METHODS)
+    try:
+        today = today_date.today()
+        payload = await get_response_cache().aget_or_set(
+            "dashboard_summary", str(today), ("dashboard",),
+            lambda: _dashboard_payload(today)
+        )
+        return json_response(payload, status=status.HTTP_200_OK)
+
+    except ConnectionFailure as e:
+        logger.error(f"MongoDB connection failure: {e}")
+        return JsonResponse({"message": "Database connection failed."},
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    except Exception as e:
+        logger.error(f"Unexpected error in dashboard_summary: {e}")
+        return JsonResponse({"message": "Internal Server Error"},
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
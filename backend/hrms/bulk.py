@@ -0,0 +1,445 @@
+"""
+Batched write paths for bulk attendance marking and employee import.
+
+These helpers replace per-row lookups and saves with a constant number of
+round trips per batch: ``$in`` queries for lookups and uniqueness checks, and
+one unordered ``bulk_write``/``insert_many`` for the writes.
+"""
+from itertools import islice
+import csv
+import json
+import logging
+
+import mongoengine as me
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from .models import Attendance, Employee, mongo_date
+from .resolver import get_employee_resolver
+from .rollups import record_attendance_changes, record_employees_added
+from .serializers import AttendanceRecordSerializer, EmployeeSerializer
+
+logger = logging.getLogger(__name__)
+
+MAX_BULK_ROWS = 10000
+IMPORT_BATCH_SIZE = 1000
+EMPLOYEE_IMPORT_FIELDS = ("employee_id", "full_name", "email", "department")
+
+DUPLICATE_KEY_ERROR = 11000
+
+# Batched compare-and-set rounds before the rows still conflicting with
+# concurrent marks are written one at a time.
+MAX_BATCH_ATTEMPTS = 2
+
+DUPLICATE_MESSAGES = {
+    "employee_id": "Employee ID already exists.",
+    "email": "Email already exists.",
+    "non_field_errors": "Employee ID or Email already exists.",
+}
+
+
+def _row_error(index, errors):
+    return {"row": index, "result": "error", "errors": errors}
+
+
+def _read_statuses(collection, keys):
+    """
+    Read the current status of many attendance records with one query.
+
+    Args:
+        collection: The attendance pymongo collection
+        keys: Iterable of (employee ObjectId, date) tuples
+
+    Returns:
+        Dictionary mapping each existing key to its status
+    """
+    keys = set(keys)
+    statuses = {}
+    for doc in collection.find(
+        {
+            "employee": {"$in": list({key[0] for key in keys})},
+            "date": {"$in": list({mongo_date(key[1]) for key in keys})},
+        },
+        {"employee": 1, "date": 1, "status": 1}
+    ):
+        key = (doc["employee"], doc["date"].date())
+        if key in keys:
+            statuses[key] = doc["status"]
+    return statuses
+
+
+def _write_statuses(collection, writes):
+    """
+    Compare-and-set the status of many attendance records in one bulk_write.
+
+    Each update only matches the record while it still has the status it was
+    read with (or is still missing). If a concurrent mark changed it, the
+    upsert tries to insert a second record for the same employee and date,
+    which the unique index rejects, so conflicts are reported per operation.
+
+    Args:
+        collection: The attendance pymongo collection
+        writes: Dictionary mapping (employee ObjectId, date) to a tuple of
+            (status read, or None if missing, new status)
+
+    Returns:
+        Tuple of (applied keys, conflicting keys, ``{key: error message}``
+        of the writes that failed otherwise)
+    """
+    keys = list(writes)
+    operations = []
+    for key in keys:
+        previous, status_value = writes[key]
+        query = {"employee": key[0], "date": mongo_date(key[1])}
+        query["status"] = previous if previous is not None else {"$exists": False}
+        operations.append(UpdateOne(query, {"$set": {"status": status_value}}, upsert=True))
+
+    try:
+        collection.bulk_write(operations, ordered=False)
+        write_errors = []
+    except BulkWriteError as e:
+        write_errors = e.details.get("writeErrors", [])
+
+    conflicts = set()
+    failed = {}
+    for error in write_errors:
+        key = keys[error["index"]]
+        if error.get("code") == DUPLICATE_KEY_ERROR:
+            conflicts.add(key)
+        else:
+            failed[key] = error.get("errmsg")
+    applied = set(keys) - conflicts - set(failed)
+    return applied, conflicts, failed
+
+
+def _update_status(collection, emp_oid, day, status_value):
+    """
+    Set the status of one attendance record, creating it if it is missing.
+
+    Returns:
+        The status before the write, or None if the record was created
+    """
+    query = {"employee": emp_oid, "date": mongo_date(day)}
+    update = {"$set": {"status": status_value}}
+    try:
+        previous = collection.find_one_and_update(query, update, {"status": 1}, upsert=True)
+    except DuplicateKeyError:
+        # Lost an insert race; the record exists now, so this is an update.
+        previous = collection.find_one_and_update(query, update, {"status": 1}, upsert=True)
+    return previous["status"] if previous else None
+
+
+def mark_attendance_rows(rows):
+    """
+    Validate and upsert many attendance rows.
+
+    The rows cost one query for the current statuses and one unordered
+    bulk_write, whether they create or re-mark records. The writes are
+    compare-and-set on the status that was read, so the rollup deltas are
+    exactly the transitions that were applied; rows a concurrent mark changed
+    in between are read and written again, and after MAX_BATCH_ATTEMPTS
+    rounds updated one find_one_and_update at a time.
+
+    Args:
+        rows: List of ``{"employee_id", "date", "status"}`` dictionaries
+
+    Returns:
+        List of per-row result dictionaries, in input order. Each has ``row``
+        (the input index) and ``result`` (``created``, ``updated`` or
+        ``error``); error results also carry ``errors``.
+    """
+    results = [None] * len(rows)
+
+    valid = []
+    for index, row in enumerate(rows):
+        serializer = AttendanceRecordSerializer(data=row)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results[index] = _row_error(index, serializer.errors)
+
+    employees = get_employee_resolver().resolve_many({data["employee_id"] for _, data in valid})
+
+    pending = {}
+    for index, data in valid:
+        emp_oid = employees.get(data["employee_id"])
+        if emp_oid is None:
+            results[index] = _row_error(index, {"employee_id": ["Employee not found."]})
+            continue
+
+        key = (emp_oid, data["date"])
+        if key in pending:
+            results[index] = _row_error(
+                index, {"non_field_errors": [f"Duplicate of row {pending[key][0]} in this batch."]}
+            )
+            continue
+        pending[key] = (index, data["status"])
+
+    if not pending:
+        return results
+
+    collection = Attendance._get_collection()
+    changes = []
+    for _ in range(MAX_BATCH_ATTEMPTS):
+        statuses = _read_statuses(collection, pending)
+        writes = {}
+        for key, (index, status_value) in pending.items():
+            if statuses.get(key) == status_value:
+                # Already marked so; nothing to write or count.
+                results[index] = {"row": index, "result": "updated"}
+            else:
+                writes[key] = (statuses.get(key), status_value)
+        if not writes:
+            pending = {}
+            break
+
+        applied, conflicts, failed = _write_statuses(collection, writes)
+        for key in applied:
+            index = pending[key][0]
+            previous, status_value = writes[key]
+            results[index] = {"row": index, "result": "updated" if previous else "created"}
+            changes.append((key[0], key[1], previous, status_value))
+        for key, message in failed.items():
+            index = pending[key][0]
+            logger.error(f"Bulk attendance write failed for row {index}: {message}")
+            results[index] = _row_error(index, {"non_field_errors": ["Error saving attendance."]})
+        pending = {key: pending[key] for key in conflicts}
+        if not pending:
+            break
+
+    for key, (index, status_value) in pending.items():
+        logger.info(f"Concurrent attendance marks for row {index}, updating it on its own")
+        try:
+            previous = _update_status(collection, key[0], key[1], status_value)
+        except Exception as e:
+            logger.error(f"Bulk attendance write failed for row {index}: {str(e)}")
+            results[index] = _row_error(index, {"non_field_errors": ["Error saving attendance."]})
+            continue
+        results[index] = {"row": index, "result": "updated" if previous else "created"}
+        changes.append((key[0], key[1], previous, status_value))
+
+    missing = record_attendance_changes(changes)
+    if missing:
+        # Employees deleted after they were resolved; drop the orphan records.
+        Attendance.objects(employee__in=list(missing)).delete()
+        resolver = get_employee_resolver()
+        for index, data in valid:
+            if employees.get(data["employee_id"]) in missing:
+                resolver.forget(data["employee_id"])
+                if results[index]["result"] != "error":
+                    results[index] = _row_error(index, {"employee_id": ["Employee not found."]})
+    return results
+
+
+# ------------------ Employee import ------------------
+
+def _iter_csv(stream):
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, {k: v for k, v in row.items() if k in EMPLOYEE_IMPORT_FIELDS}
+
+
+def _iter_ndjson(stream):
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, None
+
+
+def _iter_json_array(stream, chunk_size=65536):
+    """Decode the items of a top-level JSON array without reading it all at once."""
+    decoder = json.JSONDecoder()
+    buffer = stream.read(chunk_size).lstrip()
+    if not buffer.startswith("["):
+        raise ValueError("Expected a JSON array of employee objects")
+    buffer = buffer[1:]
+    position = 0
+    while True:
+        buffer = buffer.lstrip()
+        if buffer.startswith(","):
+            buffer = buffer[1:].lstrip()
+        if buffer.startswith("]"):
+            return
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except ValueError:
+            # The next item is split across chunks; read more and retry.
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                raise ValueError("Malformed or unterminated JSON array")
+            buffer += chunk
+            continue
+        position += 1
+        yield position, item
+        buffer = buffer[end:]
+
+
+def iter_employee_records(stream):
+    """
+    Lazily read employee records from a CSV, JSON array or NDJSON text stream.
+
+    The format is detected from the first non-blank character: ``[`` for a
+    JSON array, ``{`` for newline-delimited JSON, anything else for CSV with a
+    header line.
+
+    Args:
+        stream: A seekable text file object
+
+    Yields:
+        Tuples of (row number, record). The row number is the line number for
+        CSV and NDJSON, and the 1-based item position for JSON arrays.
+        Unparseable NDJSON lines yield None as the record.
+    """
+    head = stream.read(1)
+    while head and head.isspace():
+        head = stream.read(1)
+    stream.seek(0)
+
+    if not head:
+        return
+    if head == "[":
+        yield from _iter_json_array(stream)
+    elif head == "{":
+        yield from _iter_ndjson(stream)
+    else:
+        yield from _iter_csv(stream)
+
+
+def duplicate_field(message):
+    """Return the Employee field named in a duplicate key error message."""
+    for field in ("employee_id", "email"):
+        if f"index: {field}_" in message:
+            return field
+    return "non_field_errors"
+
+
+def _import_batch(batch, errors):
+    """
+    Validate and insert one batch of (row number, record) tuples.
+
+    Returns:
+        Number of employees inserted
+    """
+    valid = []
+    for row_number, record in batch:
+        if not isinstance(record, dict):
+            errors.append({"row": row_number, "errors": {"non_field_errors": ["Expected a JSON object."]}})
+            continue
+        serializer = EmployeeSerializer(data=record, context={"check_unique": False})
+        if serializer.is_valid():
+            valid.append((row_number, serializer.validated_data))
+        else:
+            errors.append({"row": row_number, "errors": serializer.errors})
+
+    existing_ids = set(
+        Employee.objects(employee_id__in=[data["employee_id"] for _, data in valid]).distinct("employee_id")
+    )
+    existing_emails = set(
+        Employee.objects(email__in=[data["email"] for _, data in valid]).distinct("email")
+    )
+
+    documents = []
+    document_rows = []
+    for row_number, data in valid:
+        field = None
+        if data["employee_id"] in existing_ids:
+            field = "employee_id"
+        elif data["email"] in existing_emails:
+            field = "email"
+        if field:
+            errors.append({"row": row_number, "errors": {field: [DUPLICATE_MESSAGES[field]]}})
+            continue
+        # Later rows in the same batch are checked against earlier ones too.
+        existing_ids.add(data["employee_id"])
+        existing_emails.add(data["email"])
+
+        employee = Employee(**data)
+        try:
+            employee.validate()
+        except me.ValidationError as e:
+            errors.append({"row": row_number, "errors": {
+                field: [str(message)] for field, message in e.to_dict().items()
+            }})
+            continue
+        documents.append(employee.to_mongo())
+        document_rows.append(row_number)
+
+    if not documents:
+        return 0
+
+    resolver = get_employee_resolver()
+    for document in documents:
+        resolver.forget(document["employee_id"])
+    try:
+        Employee._get_collection().insert_many(documents, ordered=False)
+        record_employees_added(len(documents))
+        return len(documents)
+    except BulkWriteError as e:
+        write_errors = e.details.get("writeErrors", [])
+        for error in write_errors:
+            row_number = document_rows[error["index"]]
+            if error.get("code") == DUPLICATE_KEY_ERROR:
+                field = duplicate_field(error.get("errmsg", ""))
+                errors.append({"row": row_number, "errors": {field: [DUPLICATE_MESSAGES[field]]}})
+            else:
+                logger.error(f"Employee import failed for row {row_number}: {error.get('errmsg')}")
+                errors.append({"row": row_number, "errors": {"non_field_errors": ["Error saving employee."]}})
+        inserted = e.details.get("nInserted", len(documents) - len(write_errors))
+        record_employees_added(inserted)
+        return inserted
+
+
+def _until_read_error(records, read_errors):
+    """Yield from records, stopping at the first parse error and recording it."""
+    iterator = iter(records)
+    while True:
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        except (ValueError, UnicodeDecodeError, csv.Error) as e:
+            read_errors.append(str(e))
+            return
+        yield item
+
+
+def import_employees(records, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Import employees from an iterable of (row number, record) tuples.
+
+    Records are consumed lazily in batches. Each batch costs two ``$in``
+    uniqueness queries and one unordered ``insert_many``. If the input cannot
+    be parsed part way through, the rows read so far are still imported and
+    the parse error is reported in ``read_error``.
+
+    Args:
+        records: Iterable of (row number, record dictionary) tuples, e.g. from
+            iter_employee_records
+        batch_size: Number of records per batch
+
+    Returns:
+        Dictionary with ``created`` (count), ``errors`` (count),
+        ``error_rows`` (list of ``{"row", "errors"}`` dictionaries) and
+        ``read_error`` (message or None)
+    """
+    read_errors = []
+    records = _until_read_error(records, read_errors)
+    created = 0
+    errors = []
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        created += _import_batch(batch, errors)
+
+    errors.sort(key=lambda error: error["row"])
+    logger.info(f"Employee import finished: {created} created, {len(errors)} errors")
+    return {
+        "created": created,
+        "errors": len(errors),
+        "error_rows": errors,
+        "read_error": read_errors[0] if read_errors else None,
+    }
@@ -0,0 +1,285 @@
+"""
+Read-through response cache for the HRMS read endpoints.
+
+Cached payloads are stored under versioned keys: every key embeds the current
+version of the namespaces it depends on (e.g. ``employees`` or
+``employee:<employee_id>``). Write paths invalidate by bumping those versions,
+which orphans the old entries without having to find or delete them; the LRU
+size cap and TTL reclaim them. A namespace that was never invalidated is at
+version 0 without being stored, so reads of arbitrary IDs create no versions.
+
+Two storage backends are available, selected by ``settings.HRMS_CACHE``:
+
+* ``local``: an in-process LRU with TTL and a size cap. Each gunicorn worker
+  has its own copy, so another worker may serve a stale payload for up to TTL
+  seconds after a write.
+* ``django``: any configured Django cache alias (e.g. Redis), shared by all
+  workers, so invalidation is immediate everywhere.
+
+``none`` disables caching.
+"""
+from collections import OrderedDict
+import threading
+import time
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+# Lifetime of a version in a shared cache. It must outlive the entries keyed
+# with it, see DjangoCacheBackend.incr().
+VERSION_TIMEOUT = 24 * 60 * 60
+
+DEFAULT_CACHE_SETTINGS = {
+    "BACKEND": "local",
+    "ALIAS": "default",
+    "MAX_ENTRIES": 1024,
+    "TTL": 30,
+}
+
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache with a per-entry TTL and a size cap.
+
+    Counters created with incr() are kept outside the LRU so a namespace
+    version can never be evicted and restart from an already-used value. Only
+    invalidated namespaces get one, so they grow with the number of written
+    employees, not with the IDs clients ask for.
+    """
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def get_many(self, keys):
+        result = {}
+        for key in keys:
+            value = self.get(key, MISSING)
+            if value is not MISSING:
+                result[key] = value
+        return result
+
+    def set(self, key, value, timeout=MISSING):
+        timeout = self.ttl if timeout is MISSING else timeout
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, key):
+        """Increment a counter that is never evicted, creating it at 1."""
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DjangoCacheBackend:
+    """Adapter exposing a Django cache alias with the LRUCache interface."""
+
+    def __init__(self, alias, ttl):
+        from django.core.cache import caches
+
+        self._cache = caches[alias]
+        self.ttl = ttl
+        self.version_timeout = None if ttl is None else max(VERSION_TIMEOUT, 2 * ttl)
+
+    def get(self, key, default=None):
+        return self._cache.get(key, default)
+
+    def get_many(self, keys):
+        return self._cache.get_many(keys)
+
+    def set(self, key, value, timeout=MISSING):
+        self._cache.set(key, value, self.ttl if timeout is MISSING else timeout)
+
+    def delete(self, key):
+        self._cache.delete(key)
+
+    def incr(self, key):
+        # Versions expire after version_timeout so abandoned namespaces do not
+        # pile up, and a shared cache may also evict them. Starting versions
+        # from the clock means a recreated one never reuses a value that keyed
+        # live entries. A missing version reads as 0: after expiry any entry
+        # keyed 0 is long gone, after an early eviction one may be served for
+        # up to the TTL, like with the local backend.
+        # add() is a no-op if another worker created the version first.
+        self._cache.add(key, int(time.time() * 1000), self.version_timeout)
+        try:
+            return self._cache.incr(key)
+        except ValueError:
+            # Evicted between add() and incr().
+            value = int(time.time() * 1000)
+            self._cache.set(key, value, self.version_timeout)
+            return value
+
+    def clear(self):
+        self._cache.clear()
+
+
+class ResponseCache:
+    """Versioned read-through cache with hit/miss accounting."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def _versions(self, namespaces):
+        version_keys = [f"hrms:v:{ns}" for ns in namespaces]
+        found = self.backend.get_many(version_keys)
+        return ".".join(str(found.get(key, 0)) for key in version_keys)
+
+    def get_or_set(self, name, params, namespaces, producer):
+        """
+        Return the cached payload for (name, params) or compute and store it.
+
+        Args:
+            name: Name of the cached read, e.g. the view name
+            params: String identifying the request variant (query string, IDs)
+            namespaces: Namespaces whose invalidation must evict this payload
+            producer: Callable returning the payload on a miss
+
+        Returns:
+            The cached or freshly produced payload
+        """
+        key, value = self._lookup(name, params, namespaces)
+        if value is not MISSING:
+            self._hit()
+            return value
+
+        self._miss()
+        value = producer()
+        self.backend.set(key, value)
+        return value
+
+    async def aget_or_set(self, name, params, namespaces, producer):
+        """
+        Async variant of get_or_set() for a coroutine function ``producer``.
+
+        The in-process LRU is read directly; shared backends do network I/O
+        and are called in a worker thread.
+        """
+        local = isinstance(self.backend, LRUCache)
+        if local:
+            key, value = self._lookup(name, params, namespaces)
+        else:
+            key, value = await sync_to_async(self._lookup)(name, params, namespaces)
+        if value is not MISSING:
+            self._hit()
+            return value
+
+        self._miss()
+        value = await producer()
+        if local:
+            self.backend.set(key, value)
+        else:
+            await sync_to_async(self.backend.set)(key, value)
+        return value
+
+    def _hit(self):
+        self.hits += 1
+        record_cache_lookup(True)
+
+    def _miss(self):
+        self.misses += 1
+        record_cache_lookup(False)
+
+    def _lookup(self, name, params, namespaces):
+        key = f"hrms:{name}:{self._versions(namespaces)}:{params}"
+        return key, self.backend.get(key, MISSING)
+
+    def invalidate(self, *namespaces):
+        """Bump the version of each namespace, orphaning dependent entries."""
+        for ns in namespaces:
+            try:
+                self.backend.incr(f"hrms:v:{ns}")
+            except Exception as e:
+                logger.error(f"Failed to invalidate cache namespace {ns}: {str(e)}")
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+        if isinstance(self.backend, LRUCache):
+            stats["entries"] = len(self.backend)
+            stats["max_entries"] = self.backend.max_entries
+        return stats
+
+
+class NullCache(ResponseCache):
+    """ResponseCache stand-in used when caching is disabled."""
+
+    def __init__(self):
+        super().__init__(backend=None)
+
+    def get_or_set(self, name, params, namespaces, producer):
+        self._miss()
+        return producer()
+
+    async def aget_or_set(self, name, params, namespaces, producer):
+        self._miss()
+        return await producer()
+
+    def invalidate(self, *namespaces):
+        pass
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Return the process-wide ResponseCache configured by settings.HRMS_CACHE."""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                config = {**DEFAULT_CACHE_SETTINGS, **getattr(settings, "HRMS_CACHE", {})}
+                if config["BACKEND"] == "none":
+                    _response_cache = NullCache()
+                elif config["BACKEND"] == "django":
+                    _response_cache = ResponseCache(DjangoCacheBackend(config["ALIAS"], config["TTL"]))
+                else:
+                    _response_cache = ResponseCache(LRUCache(config["MAX_ENTRIES"], config["TTL"]))
+    return _response_cache
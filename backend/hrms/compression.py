@@ -0,0 +1,144 @@
+"""
+Negotiated gzip/brotli compression of API responses.
+
+hrms.middleware.compression_middleware calls compress_response() on every
+response. A response is compressed when the client accepts an encoding, its
+content type is text-like (JSON, CSV, NDJSON...) and its body reaches
+``HRMS_COMPRESSION_MIN_SIZE`` bytes; brotli is preferred when the ``brotli``
+package is installed and the client accepts it. Streaming responses (the
+attendance exports) are compressed chunk by chunk and flushed after every
+chunk, so rows still reach the client as they are produced.
+
+Compressed responses get ``Vary: Accept-Encoding`` and a weak ETag, since the
+bytes differ from the uncompressed representation; If-None-Match still
+matches because Django compares ETags weakly.
+"""
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_BROTLI_QUALITY = 4
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/javascript", "application/xml",
+    "text/",
+)
+
+
+def accepted_encoding(accept_encoding):
+    """
+    Pick the encoding to use from an Accept-Encoding header.
+
+    Returns:
+        ``"br"``, ``"gzip"`` or None
+    """
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualities[coding.strip().lower()] = q
+
+    star = qualities.get("*", 0.0)
+    if brotli is not None and qualities.get("br", star) > 0:
+        return "br"
+    if qualities.get("gzip", star) > 0:
+        return "gzip"
+    return None
+
+
+class _Compressor:
+    """Incremental compressor with the same interface for both encodings."""
+
+    def __init__(self, encoding):
+        if encoding == "br":
+            quality = getattr(settings, "HRMS_BROTLI_QUALITY", DEFAULT_BROTLI_QUALITY)
+            self._brotli = brotli.Compressor(quality=quality)
+        else:
+            level = getattr(settings, "HRMS_GZIP_LEVEL", DEFAULT_GZIP_LEVEL)
+            self._brotli = None
+            # wbits 31: deflate with a gzip header and trailer
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def chunk(self, data):
+        """Compress ``data`` and flush, so the output is decodable so far."""
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+    def whole(self, data):
+        """Compress a complete body."""
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+def _compress_sequence(encoding, chunks):
+    compressor = _Compressor(encoding)
+    for data in chunks:
+        out = compressor.chunk(data)
+        if out:
+            yield out
+    yield compressor.finish()
+
+
+async def _acompress_sequence(encoding, chunks):
+    compressor = _Compressor(encoding)
+    async for data in chunks:
+        out = compressor.chunk(data)
+        if out:
+            yield out
+    yield compressor.finish()
+
+
+def compress_response(request, response):
+    """Compress ``response`` in place if the request and content allow it."""
+    if response.has_header("Content-Encoding"):
+        return response
+    content_type = response.get("Content-Type", "").lower()
+    if not content_type.startswith(COMPRESSIBLE_TYPES):
+        return response
+
+    patch_vary_headers(response, ("Accept-Encoding",))
+    encoding = accepted_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+    if encoding is None:
+        return response
+
+    if response.streaming:
+        if response.is_async:
+            response.streaming_content = _acompress_sequence(encoding, response.streaming_content)
+        else:
+            response.streaming_content = _compress_sequence(encoding, response.streaming_content)
+        del response["Content-Length"]
+    else:
+        if len(response.content) < getattr(settings, "HRMS_COMPRESSION_MIN_SIZE", DEFAULT_MIN_SIZE):
+            return response
+        compressed = _Compressor(encoding).whole(response.content)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+
+    etag = response.get("ETag")
+    if etag and etag.startswith('"'):
+        response["ETag"] = "W/" + etag
+    response["Content-Encoding"] = encoding
+    return response
@@ -0,0 +1,224 @@
+"""
+Conditional GET support for the employee and attendance reads.
+
+ETags and Last-Modified dates come from version counters that the write
+paths maintain (see hrms.rollups), never from hashing a response body:
+
+* the employee list uses the ``employees`` Counter document, bumped on every
+  create/delete/import and every attendance change;
+* an employee's attendance uses the ``version`` and ``updated_at`` fields of
+  that Employee document.
+
+Checking either costs one point read, so a matching ``If-None-Match`` is
+answered with 304 before any of the view's queries run. The ``a``-prefixed
+variants do the same reads through Motor for the async views.
+"""
+from datetime import timezone as dt_timezone
+from functools import wraps
+import logging
+
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import condition
+
+from .async_mongo import get_async_db
+from .models import Counter, Employee
+from .rollups import EMPLOYEE_COUNTER
+
+logger = logging.getLogger(__name__)
+
+# Bump when the response format changes so clients drop old representations.
+REPRESENTATION_VERSION = "1"
+
+
+def _memoized(request, key, loader):
+    """Load a version once per request; lookup failures fall back to None."""
+    request = getattr(request, "_request", request)
+    versions = request.__dict__.setdefault("_hrms_versions", {})
+    if key not in versions:
+        try:
+            versions[key] = loader()
+        except Exception as e:
+            logger.warning(f"Could not load version for {key}, skipping conditional GET: {str(e)}")
+            versions[key] = None
+    return versions[key]
+
+
+async def _amemoized(request, key, loader):
+    """Async variant of _memoized() for a coroutine function ``loader``."""
+    versions = request.__dict__.setdefault("_hrms_versions", {})
+    if key not in versions:
+        try:
+            versions[key] = await loader()
+        except Exception as e:
+            logger.warning(f"Could not load version for {key}, skipping conditional GET: {str(e)}")
+            versions[key] = None
+    return versions[key]
+
+
+def _counter_version(doc):
+    # Every write creates the counter, so without one nothing changed yet.
+    if not doc:
+        return "0", None
+    return str(doc.get("version", 0)), doc.get("updated_at")
+
+
+def _employee_version(doc):
+    if not doc:
+        return None
+    return f"{doc['_id']}.{doc.get('version', 0)}", doc.get("updated_at")
+
+
+def employees_version(request):
+    """Return (version tag, updated_at) for the employee list, or None."""
+    def load():
+        return _counter_version(Counter._get_collection().find_one(
+            {"_id": EMPLOYEE_COUNTER}, {"version": 1, "updated_at": 1}
+        ))
+
+    return _memoized(request, "employees", load)
+
+
+def employee_version(request, employee_id):
+    """Return (version tag, updated_at) for one employee's attendance, or None."""
+    def load():
+        return _employee_version(
+            Employee.objects(employee_id=employee_id).only("version", "updated_at").as_pymongo().first()
+        )
+
+    return _memoized(request, f"employee:{employee_id}", load)
+
+
+async def aemployees_version(request):
+    """Async variant of employees_version() reading through Motor."""
+    async def load():
+        return _counter_version(await get_async_db()[Counter._meta["collection"]].find_one(
+            {"_id": EMPLOYEE_COUNTER}, {"version": 1, "updated_at": 1}
+        ))
+
+    return await _amemoized(request, "employees", load)
+
+
+async def aemployee_version(request, employee_id):
+    """Async variant of employee_version() reading through Motor."""
+    async def load():
+        return _employee_version(await get_async_db()[Employee._meta["collection"]].find_one(
+            {"employee_id": employee_id}, {"version": 1, "updated_at": 1}
+        ))
+
+    return await _amemoized(request, f"employee:{employee_id}", load)
+
+
+def version_tag(version):
+    """Return the version tag for a cache key, or an empty string if unknown."""
+    return version[0] if version else ""
+
+
+def _last_modified(version):
+    return version[1] if version else None
+
+
+def _employees_etag(version):
+    return f'"employees-{REPRESENTATION_VERSION}-{version[0]}"' if version else None
+
+
+def _attendance_etag(version):
+    return f'"attendance-{REPRESENTATION_VERSION}-{version[0]}"' if version else None
+
+
+def list_employees_etag(request, *args, **kwargs):
+    return _employees_etag(employees_version(request))
+
+
+def list_employees_last_modified(request, *args, **kwargs):
+    return _last_modified(employees_version(request))
+
+
+def employee_attendance_etag(request, employee_id, *args, **kwargs):
+    return _attendance_etag(employee_version(request, employee_id))
+
+
+def employee_attendance_last_modified(request, employee_id, *args, **kwargs):
+    return _last_modified(employee_version(request, employee_id))
+
+
+async def alist_employees_etag(request, *args, **kwargs):
+    return _employees_etag(await aemployees_version(request))
+
+
+async def alist_employees_last_modified(request, *args, **kwargs):
+    return _last_modified(await aemployees_version(request))
+
+
+async def aemployee_attendance_etag(request, employee_id, *args, **kwargs):
+    return _attendance_etag(await aemployee_version(request, employee_id))
+
+
+async def aemployee_attendance_last_modified(request, employee_id, *args, **kwargs):
+    return _last_modified(await aemployee_version(request, employee_id))
+
+
+def _mark_revalidate(response):
+    if response.status_code in (200, 304):
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        del response["ETag"]
+        del response["Last-Modified"]
+    return response
+
+
+def conditional_get(etag_func, last_modified_func):
+    """
+    Answer conditional GETs with 304 and mark responses for revalidation.
+
+    Wraps Django's ``condition`` decorator. Successful responses get
+    ``Cache-Control: private, no-cache`` so browsers cache the body but always
+    revalidate with ``If-None-Match``. Error responses drop the validators.
+    Apply it outside ``@api_view``.
+    """
+    def decorator(view):
+        conditional_view = condition(etag_func, last_modified_func)(view)
+
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            return _mark_revalidate(conditional_view(request, *args, **kwargs))
+
+        return inner
+
+    return decorator
+
+
+def async_conditional_get(etag_func, last_modified_func):
+    """
+    conditional_get() for async views, with coroutine validator functions.
+
+    Django 4.2's ``condition`` decorator cannot wrap coroutines, so this
+    repeats its GET/HEAD handling around ``get_conditional_response``.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return await view(request, *args, **kwargs)
+
+            etag = await etag_func(request, *args, **kwargs)
+            last_modified = await last_modified_func(request, *args, **kwargs)
+            if last_modified is not None:
+                if timezone.is_naive(last_modified):
+                    last_modified = timezone.make_aware(last_modified, dt_timezone.utc)
+                last_modified = int(last_modified.timestamp())
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+                if response.status_code == 200:
+                    if last_modified is not None and not response.has_header("Last-Modified"):
+                        response.headers["Last-Modified"] = http_date(last_modified)
+                    if etag:
+                        response.headers.setdefault("ETag", etag)
+            return _mark_revalidate(response)
+
+        return inner
+
+    return decorator
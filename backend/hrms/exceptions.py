@@ -41,6 +41,12 @@ class UnauthorizedException(HRMSException):
         super().__init__(message, status_code, error_code)
 
 
+class QueryBudgetExceeded(HRMSException):
+    """Raised when a request issues more MongoDB commands than HRMS_QUERY_BUDGET allows"""
+    def __init__(self, message, status_code=500, error_code="QUERY_BUDGET_EXCEEDED"):
+        super().__init__(message, status_code, error_code)
+
+
 def format_error_response(exc):
     """
     Format exception into a standardized error response.
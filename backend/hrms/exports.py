@@ -0,0 +1,123 @@
+"""
+Streaming encoders for attendance exports.
+
+The generators in this module consume raw ``as_pymongo()`` attendance
+documents one at a time so an export never holds more than a single cursor
+batch in memory, whatever the size of the date range. The ``a``-prefixed
+versions do the same over a Motor cursor for the async export view, so under
+ASGI each chunk is sent as soon as it is encoded.
+"""
+import csv
+import json
+
+EXPORT_COLUMNS = ["id", "employee_id", "date", "status"]
+
+# Rows are encoded one by one but flushed in small chunks, so the first byte
+# still goes out immediately without paying a socket write per row.
+CHUNK_ROWS = 200
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+class _Echo:
+    """File-like object whose write() returns the value instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def _export_row(doc, employee_ids):
+    return {
+        "id": str(doc["_id"]),
+        "employee_id": employee_ids.get(doc["employee"], ""),
+        "date": doc["date"].date().isoformat(),
+        "status": doc["status"],
+    }
+
+
+def export_rows(documents, employee_ids):
+    """
+    Convert raw attendance documents into export rows.
+
+    Args:
+        documents: Iterable of attendance documents from an ``as_pymongo()`` cursor
+        employee_ids: Mapping of Employee ObjectId to the public employee_id
+
+    Yields:
+        Dictionaries keyed by EXPORT_COLUMNS
+    """
+    for doc in documents:
+        yield _export_row(doc, employee_ids)
+
+
+async def aexport_rows(documents, employee_ids):
+    """Async export_rows, over a Motor cursor."""
+    async for doc in documents:
+        yield _export_row(doc, employee_ids)
+
+
+def _chunked(lines):
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= CHUNK_ROWS:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def _encoder(export_format):
+    """Return the header line (or None) and the row encoder of a format."""
+    if export_format == "csv":
+        writer = csv.DictWriter(_Echo(), fieldnames=EXPORT_COLUMNS)
+        return writer.writeheader(), writer.writerow
+    return None, lambda row: json.dumps(row) + "\n"
+
+
+def stream_ndjson(rows):
+    """Encode rows as newline-delimited JSON."""
+    return stream_export("ndjson", rows)
+
+
+def stream_csv(rows):
+    """Encode rows as CSV with a header line."""
+    return stream_export("csv", rows)
+
+
+def stream_export(export_format, rows):
+    """
+    Encode rows in the requested export format.
+
+    Args:
+        export_format: One of the EXPORT_FORMATS keys
+        rows: Iterable of export rows
+
+    Returns:
+        Generator of encoded text chunks
+    """
+    header, encode = _encoder(export_format)
+
+    def lines():
+        if header is not None:
+            yield header
+        for row in rows:
+            yield encode(row)
+
+    return _chunked(lines())
+
+
+async def astream_export(export_format, rows):
+    """Async stream_export, over an async iterable of rows."""
+    header, encode = _encoder(export_format)
+    chunk = [header] if header is not None else []
+    async for row in rows:
+        chunk.append(encode(row))
+        if len(chunk) >= CHUNK_ROWS:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
@@ -0,0 +1,109 @@
+"""
+Readiness check for load balancer probes.
+
+A worker is ready when a MongoDB ping answers within ``HRMS_HEALTH_PING_TIMEOUT_MS``,
+the unique indexes the write paths rely on exist and every connection pool
+(one per client and server) has a free connection. The ping runs on the
+worker's own client under a pymongo.timeout() block, so it tests the pool
+requests use and fails fast instead of waiting for the full server selection
+timeout.
+
+The result is cached for ``HRMS_HEALTH_CACHE_SECONDS`` and concurrent probes
+share a single ping, so frequent probes add no load on MongoDB.
+"""
+from datetime import datetime, timezone
+import threading
+import time
+
+import mongoengine as me
+import pymongo
+from django.conf import settings
+
+from .indexes import ensure_unique_indexes, unique_indexes_ready
+from .monitoring import get_pool_monitors
+
+DEFAULT_PING_TIMEOUT_MS = 500
+DEFAULT_CACHE_SECONDS = 2
+
+_cached = None
+_cached_at = 0.0
+_lock = threading.Lock()
+
+
+def _check_mongo(timeout_ms):
+    start = time.perf_counter()
+    try:
+        with pymongo.timeout(timeout_ms / 1000):
+            me.get_connection().admin.command("ping")
+    except Exception as e:
+        return {"ok": False, "error": str(e), "timeout_ms": timeout_ms}
+    return {"ok": True, "rtt_ms": round((time.perf_counter() - start) * 1000, 2), "timeout_ms": timeout_ms}
+
+
+def _check_indexes(mongo_ok):
+    # A failed build at connect time is retried here, once MongoDB answers.
+    if mongo_ok and not unique_indexes_ready():
+        try:
+            ensure_unique_indexes()
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+    return {"ok": unique_indexes_ready()}
+
+
+def _check_pool():
+    pools = {}
+    failures = 0
+    for client, monitor in get_pool_monitors().items():
+        stats = monitor.stats()
+        failures += sum(stats["checkout_failures"].values())
+        pools[client] = {
+            address: {
+                "in_use": pool["in_use"],
+                "max_pool_size": pool["max_pool_size"],
+                "saturation": round(pool["in_use"] / pool["max_pool_size"], 4) if pool["max_pool_size"] else None,
+            }
+            for address, pool in stats["pools"].items()
+        }
+    saturations = [
+        pool["saturation"] for client_pools in pools.values() for pool in client_pools.values()
+        if pool["saturation"] is not None
+    ]
+    return {
+        # A pool without a free connection makes the next request to that
+        # server queue for one.
+        "ok": all(saturation < 1 for saturation in saturations),
+        "saturation": max(saturations, default=0.0),
+        "pools": pools,
+        "checkout_failures": failures,
+    }
+
+
+def check_readiness():
+    """
+    Return this worker's readiness report, from cache when it is recent.
+
+    Returns:
+        Dictionary with ``ready``, the ``mongo`` ping, ``indexes`` and ``pool`` checks,
+        ``checked_at`` and ``cached``
+    """
+    global _cached, _cached_at
+    ttl = getattr(settings, "HRMS_HEALTH_CACHE_SECONDS", DEFAULT_CACHE_SECONDS)
+    with _lock:
+        if _cached is not None and time.monotonic() - _cached_at < ttl:
+            return {**_cached, "cached": True}
+
+        mongo = _check_mongo(getattr(settings, "HRMS_HEALTH_PING_TIMEOUT_MS", DEFAULT_PING_TIMEOUT_MS))
+        indexes = _check_indexes(mongo["ok"])
+        try:
+            pool = _check_pool()
+        except Exception as e:
+            pool = {"ok": False, "error": str(e)}
+        _cached = {
+            "ready": mongo["ok"] and indexes["ok"] and pool["ok"],
+            "mongo": mongo,
+            "indexes": indexes,
+            "pool": pool,
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+        }
+        _cached_at = time.monotonic()
+        return {**_cached, "cached": False}
@@ -0,0 +1,244 @@
+"""
+Index management and query plan reporting for the HRMS collections.
+
+The index set is declared in each document's ``meta``. mongoengine's automatic
+index creation is disabled there because it runs on the first query against a
+collection and blocks that request until every index is built. Instead each
+worker builds the unique indexes with ensure_unique_indexes() as soon as it is
+connected, and reports itself as not ready until they exist, since the write
+paths rely on them to reject duplicates. The secondary indexes only speed up
+reads and are built afterwards with ensure_all_indexes(), both in the
+background (see hrms.mongo.start_boot_tasks). Deployments can also run
+``python manage.py ensure_indexes`` ahead of a release.
+
+QUERIES lists the read queries the API issues, so the command's ``--explain``
+option can show which index each one uses.
+"""
+from datetime import date
+import logging
+import os
+import re
+
+from bson import ObjectId
+
+from .aggregations import attendance_counts_pipeline, monthly_attendance_pipeline
+from .models import SEARCH_PREFIX_LENGTH, Attendance, Counter, DailyAttendanceStats, Employee, mongo_date
+from .rollups import DAILY_STATS_PIPELINE, EMPLOYEE_COUNTER
+
+logger = logging.getLogger(__name__)
+
+DOCUMENTS = (Employee, Attendance, DailyAttendanceStats, Counter)
+
+# PID of the process that last confirmed the unique indexes exist.
+_unique_pid = None
+
+
+def ensure_all_indexes():
+    """
+    Create any declared index that is missing.
+
+    Returns:
+        Dictionary mapping collection name to the names of indexes that are
+        declared or created, and the extra ones found in the database
+    """
+    report = {}
+    for document in DOCUMENTS:
+        document.ensure_indexes()
+        compared = document.compare_indexes()
+        collection = document._get_collection()
+        report[collection.name] = {
+            "indexes": sorted(collection.index_information()),
+            "extra": compared["extra"],
+        }
+    return report
+
+
+def ensure_unique_indexes():
+    """
+    Create any declared unique index that is missing, waiting until it is built.
+
+    Once the indexes are in place this costs one listIndexes command per
+    collection, and needs no privilege to create indexes.
+
+    Raises:
+        pymongo.errors.PyMongoError: If MongoDB cannot be reached, or an index
+            cannot be built because the collection already holds duplicates
+    """
+    global _unique_pid
+    for document in DOCUMENTS:
+        specs = [spec for spec in document._meta["index_specs"] if spec.get("unique")]
+        if not specs:
+            continue
+        collection = document._get_collection()
+        existing = {
+            tuple(info["key"]) for info in collection.index_information().values() if info.get("unique")
+        }
+        for spec in specs:
+            spec = spec.copy()
+            fields = spec.pop("fields")
+            if tuple(fields) not in existing:
+                collection.create_index(fields, **spec)
+    _unique_pid = os.getpid()
+
+
+def unique_indexes_ready():
+    """Return True once ensure_unique_indexes() has succeeded in this process."""
+    return _unique_pid == os.getpid()
+
+
+def _sample():
+    """Pick real values to explain the queries with, falling back to placeholders."""
+    attendance = Attendance._get_collection().find_one({}, {"employee": 1, "date": 1})
+    employee = None
+    if attendance:
+        employee = Employee._get_collection().find_one({"_id": attendance["employee"]})
+    if employee is None:
+        employee = Employee._get_collection().find_one({}) or {}
+    day = attendance["date"].date() if attendance else date.today()
+    return {
+        "oid": employee.get("_id", ObjectId()),
+        "employee_id": employee.get("employee_id", "EMP000000"),
+        "email": employee.get("email", "nobody@example.com"),
+        "department": employee.get("department", "Engineering"),
+        "day": day,
+        "month_start": day.replace(day=1),
+    }
+
+
+def _find(document, query, projection=None, sort=None, limit=0):
+    def explain(sample):
+        cursor = document._get_collection().find(query(sample), projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        if limit:
+            cursor = cursor.limit(limit)
+        return cursor.explain()
+    return explain
+
+
+def _aggregate(document, pipeline):
+    def explain(sample):
+        collection = document._get_collection()
+        return collection.database.command(
+            "explain",
+            {"aggregate": collection.name, "pipeline": pipeline(sample), "cursor": {}},
+            verbosity="executionStats"
+        )
+    return explain
+
+
+def _count(document, query):
+    def explain(sample):
+        collection = document._get_collection()
+        return collection.database.command(
+            "explain", {"count": collection.name, "query": query(sample)}, verbosity="executionStats"
+        )
+    return explain
+
+
+# (name, explain function taking the sample values)
+QUERIES = [
+    ("list_employees", _find(Employee, lambda s: {}, sort=[("_id", -1)], limit=101)),
+    ("list_employees page", _find(
+        Employee, lambda s: {"_id": {"$lt": s["oid"]}}, sort=[("_id", -1)], limit=101
+    )),
+    ("search_employees q", _find(
+        Employee, lambda s: {"search_prefixes": s["employee_id"][:2].lower()}, sort=[("_id", -1)], limit=21
+    )),
+    ("search_employees long q", _find(
+        Employee, lambda s: {
+            "search_prefixes": s["employee_id"][:SEARCH_PREFIX_LENGTH].lower(),
+            "search_terms": {"$regex": f"^{re.escape(s['employee_id'].lower())}"},
+        }, sort=[("_id", -1)], limit=21
+    )),
+    ("search_employees q + department", _find(
+        Employee, lambda s: {
+            "search_prefixes": s["employee_id"][:2].lower(), "department": s["department"]
+        }, sort=[("_id", -1)], limit=21
+    )),
+    ("search_employees department", _find(
+        Employee, lambda s: {"department": s["department"]}, sort=[("_id", -1)], limit=21
+    )),
+    ("employee by employee_id", _find(Employee, lambda s: {"employee_id": s["employee_id"]}, limit=1)),
+    ("employee by email", _find(Employee, lambda s: {"email": s["email"]}, limit=1)),
+    ("mark_attendance upsert", _find(
+        Attendance, lambda s: {"employee": s["oid"], "date": mongo_date(s["day"])}, {"status": 1}
+    )),
+    ("employee_attendance", _find(
+        Attendance, lambda s: {"employee": s["oid"]}, {"date": 1, "status": 1}, sort=[("date", -1)]
+    )),
+    ("employee_attendance month", _find(
+        Attendance, lambda s: {"employee": s["oid"], "date": {
+            "$gte": mongo_date(s["month_start"]), "$lte": mongo_date(s["day"])
+        }}, {"date": 1, "status": 1}, sort=[("date", -1)]
+    )),
+    ("employee_attendance monthly summary", _aggregate(
+        Attendance, lambda s: monthly_attendance_pipeline(s["oid"])
+    )),
+    ("export employee", _find(Attendance, lambda s: {"employee": s["oid"]}, sort=[("date", -1)])),
+    ("export all", _find(Attendance, lambda s: {}, sort=[("employee", -1), ("date", -1)])),
+    ("employee present count", _count(Attendance, lambda s: {"employee": s["oid"], "status": "Present"})),
+    ("daily present count", _count(Attendance, lambda s: {"date": mongo_date(s["day"]), "status": "Present"})),
+    ("attendance_counts", _aggregate(Attendance, lambda s: attendance_counts_pipeline())),
+    ("rebuild_daily_stats", _aggregate(Attendance, lambda s: DAILY_STATS_PIPELINE)),
+    ("dashboard daily stats", _find(DailyAttendanceStats, lambda s: {"_id": mongo_date(s["day"])}, limit=1)),
+    ("employee counter", _find(Counter, lambda s: {"_id": EMPLOYEE_COUNTER}, limit=1)),
+]
+
+
+def _winning_plan(explain):
+    """Return the winning plan of a find, count or aggregate explain."""
+    if "queryPlanner" not in explain and explain.get("stages"):
+        explain = explain["stages"][0]["$cursor"]
+    plan = explain["queryPlanner"]["winningPlan"]
+    # Plans run by the slot-based engine are nested one level deeper.
+    return plan.get("queryPlan", plan)
+
+
+def _stages(plan):
+    stage = plan.get("stage", "?")
+    if plan.get("indexName"):
+        stage = f"{stage}({plan['indexName']})"
+    yield stage
+    children = plan.get("inputStages") or ([plan["inputStage"]] if "inputStage" in plan else [])
+    for child in children:
+        yield from _stages(child)
+
+
+def _execution_stats(explain):
+    if "executionStats" in explain:
+        return explain["executionStats"]
+    for stage in explain.get("stages", []):
+        if "$cursor" in stage:
+            return stage["$cursor"].get("executionStats", {})
+    return {}
+
+
+def explain_queries():
+    """
+    Explain every query in QUERIES against the current data.
+
+    Returns:
+        List of dictionaries with the query name, its plan stages (root
+        first), keys/documents examined and whether it needs attention: a
+        collection scan, an in-memory sort, or an error
+    """
+    sample = _sample()
+    report = []
+    for name, explain in QUERIES:
+        try:
+            result = explain(sample)
+        except Exception as e:
+            report.append({"query": name, "plan": [], "error": str(e), "warning": True})
+            continue
+        stages = list(_stages(_winning_plan(result)))
+        stats = _execution_stats(result)
+        report.append({
+            "query": name,
+            "plan": stages,
+            "keys_examined": stats.get("totalKeysExamined"),
+            "docs_examined": stats.get("totalDocsExamined"),
+            "returned": stats.get("nReturned"),
+            "warning": any(stage in ("COLLSCAN", "SORT") for stage in stages),
+        })
+    return report
@@ -0,0 +1,59 @@
+"""
+ASGI lifespan handling for the HRMS API.
+
+Django's ASGI handler ignores ``lifespan`` events, so MongoLifespan wraps it to
+open the MongoDB connections when the server starts (instead of at import
+time or on the first request) and close them on shutdown. Servers without
+lifespan support get the same setup lazily on their first request.
+"""
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
+
+from .async_mongo import close_async_mongo, connect_async_mongo, warm_up_async_mongo
+from .mongo import ensure_connected
+
+logger = logging.getLogger(__name__)
+
+
+class MongoLifespan:
+    def __init__(self, app):
+        self.app = app
+        self._started = False
+        self._lock = asyncio.Lock()
+
+    async def startup(self):
+        async with self._lock:
+            if self._started:
+                return
+            # mongoengine for the sync views, Motor for the async ones.
+            await sync_to_async(ensure_connected)()
+            connect_async_mongo()
+            await warm_up_async_mongo()
+            self._started = True
+
+    async def shutdown(self):
+        close_async_mongo()
+        self._started = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "lifespan":
+            if not self._started:
+                await self.startup()
+            return await self.app(scope, receive, send)
+
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    logger.error(f"Startup failed: {str(e)}")
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
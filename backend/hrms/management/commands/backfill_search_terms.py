@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+
+from hrms.models import Employee, employee_search_prefixes, employee_search_terms
+from hrms.mongo import connect_mongo
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the search_terms and search_prefixes of every employee, e.g. "
+        "for employees created before employee search existed."
+    )
+
+    def handle(self, *args, **options):
+        connect_mongo()
+
+        collection = Employee._get_collection()
+        fields = ("employee_id", "full_name", "email", "department", "search_terms", "search_prefixes")
+        updates = []
+        checked = updated = 0
+        for emp in Employee.objects.only(*fields).as_pymongo().batch_size(BATCH_SIZE):
+            checked += 1
+            terms = employee_search_terms(
+                emp.get("employee_id"), emp.get("full_name"), emp.get("email"), emp.get("department")
+            )
+            prefixes = employee_search_prefixes(terms)
+            if emp.get("search_terms") == terms and emp.get("search_prefixes") == prefixes:
+                continue
+            updates.append(UpdateOne(
+                {"_id": emp["_id"]}, {"$set": {"search_terms": terms, "search_prefixes": prefixes}}
+            ))
+            if len(updates) >= BATCH_SIZE:
+                collection.bulk_write(updates, ordered=False)
+                updated += len(updates)
+                updates = []
+        if updates:
+            collection.bulk_write(updates, ordered=False)
+            updated += len(updates)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {checked} employees, updated search terms of {updated}"
+        ))
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+
+from hrms.aggregations import attendance_counts
+from hrms.models import Counter, Employee
+from hrms.mongo import connect_mongo
+from hrms.rollups import EMPLOYEE_COUNTER
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare each employee's present_count/absent_count with the attendance "
+        "collection and report (or fix) any drift."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true", help="Overwrite drifted counters with the recounted values")
+
+    def handle(self, *args, **options):
+        connect_mongo()
+
+        now = datetime.utcnow()
+        counts = attendance_counts()
+        no_records = {"present": 0, "absent": 0}
+        fixes = []
+        checked = 0
+        for emp in Employee.objects.only("employee_id", "present_count", "absent_count").as_pymongo():
+            checked += 1
+            expected = counts.get(emp["_id"], no_records)
+            actual = {"present": emp.get("present_count"), "absent": emp.get("absent_count")}
+            if actual == expected:
+                continue
+
+            self.stdout.write(
+                f"{emp['employee_id']}: present {actual['present']} -> {expected['present']}, "
+                f"absent {actual['absent']} -> {expected['absent']}"
+            )
+            fixes.append(UpdateOne(
+                {"_id": emp["_id"]},
+                {
+                    "$set": {
+                        "present_count": expected["present"],
+                        "absent_count": expected["absent"],
+                        "updated_at": now,
+                    },
+                    "$inc": {"version": 1},
+                }
+            ))
+
+        if fixes and options["fix"]:
+            for start in range(0, len(fixes), 1000):
+                Employee._get_collection().bulk_write(fixes[start:start + 1000], ordered=False)
+            # Invalidate ETags of the employee list too.
+            Counter._get_collection().update_one(
+                {"_id": EMPLOYEE_COUNTER}, {"$inc": {"version": 1}, "$set": {"updated_at": now}},
+                upsert=True
+            )
+
+        action = "fixed" if options["fix"] else "found"
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {checked} employees, {action} {len(fixes)} with drifted counters"
+        ))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from hrms.indexes import ensure_all_indexes, explain_queries
+from hrms.mongo import connect_mongo
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the indexes declared on the HRMS documents and optionally show "
+        "the query plan of every read query the API issues."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--explain", action="store_true",
+            help="Report the winning plan of each query (run against realistic data)"
+        )
+
+    def handle(self, *args, **options):
+        connect_mongo(warm=False)
+
+        for collection, info in ensure_all_indexes().items():
+            self.stdout.write(f"{collection}: {', '.join(info['indexes'])}")
+            if info["extra"]:
+                self.stdout.write(self.style.WARNING(
+                    f"  not declared in the models: {info['extra']}"
+                ))
+        self.stdout.write(self.style.SUCCESS("Indexes are in place"))
+
+        if not options["explain"]:
+            return
+
+        warnings = 0
+        for row in explain_queries():
+            line = f"{row['query']}: {' <- '.join(row['plan'])}"
+            if row.get("error"):
+                line = f"{row['query']}: explain failed: {row['error']}"
+            elif row["keys_examined"] is not None:
+                line += (
+                    f" (keys {row['keys_examined']}, docs {row['docs_examined']}, "
+                    f"returned {row['returned']})"
+                )
+            if row["warning"]:
+                warnings += 1
+                self.stdout.write(self.style.WARNING(line))
+            else:
+                self.stdout.write(line)
+
+        summary = f"{warnings} queries need attention (collection scan, in-memory sort or failed explain)"
+        self.stdout.write(self.style.WARNING(summary) if warnings else self.style.SUCCESS(summary))
@@ -0,0 +1,41 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hrms.bulk import IMPORT_BATCH_SIZE, import_employees, iter_employee_records
+from hrms.indexes import ensure_unique_indexes
+from hrms.mongo import connect_mongo
+
+
+class Command(BaseCommand):
+    help = "Import employees from a CSV, JSON array or NDJSON file in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File with employee_id, full_name, email and department per record")
+        parser.add_argument(
+            "--batch-size", type=int, default=IMPORT_BATCH_SIZE,
+            help=f"Records per insert batch (default {IMPORT_BATCH_SIZE})"
+        )
+
+    def handle(self, *args, **options):
+        connect_mongo()
+        try:
+            # Rows racing other writers are only rejected by these indexes.
+            ensure_unique_indexes()
+        except Exception as e:
+            raise CommandError(f"Could not build the unique employee indexes: {e}")
+
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+                result = import_employees(iter_employee_records(stream), batch_size=options["batch_size"])
+        except OSError as e:
+            raise CommandError(f"Could not open {options['path']}: {e}")
+
+        for error in result["error_rows"]:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'])}")
+        if result["read_error"]:
+            self.stderr.write(self.style.ERROR(f"Stopped reading input: {result['read_error']}"))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['created']} employees ({result['errors']} rows rejected)"
+        ))
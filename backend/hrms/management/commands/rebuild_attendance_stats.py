@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from hrms.mongo import connect_mongo
+from hrms.rollups import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily attendance rollups and employee counter from the raw collections."
+
+    def handle(self, *args, **options):
+        connect_mongo()
+        days, employees = rebuild_daily_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt attendance stats for {days} dates; employee count is {employees}"
+        ))
@@ -0,0 +1,151 @@
+"""
+Prometheus metrics for the HRMS API, served at ``GET /metrics``.
+
+* ``hrms_http_request_duration_seconds``: latency per route, method and status
+  (recorded by metrics_middleware);
+* ``hrms_http_requests_in_progress``: requests being served;
+* ``hrms_mongo_command_duration_seconds``: MongoDB command latency per
+  collection and command;
+* ``hrms_mongo_pool_connections`` and ``hrms_mongo_pool_checkout_wait_seconds``:
+  pool utilization;
+* ``hrms_cache_requests_total``: response cache hits and misses.
+
+Each gunicorn worker keeps its own values. When ``PROMETHEUS_MULTIPROC_DIR``
+is set (it must be before the app is imported) the workers write them to
+memory-mapped files in that directory and /metrics aggregates all of them, so
+any worker can answer a scrape; gunicorn.conf.py clears the directory at start
+and removes the files of workers that exit.
+"""
+import os
+import threading
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+from prometheus_client import multiprocess
+from pymongo import monitoring
+
+# Commands whose first field is not the collection name.
+DATABASE_COMMANDS = {"ping", "hello", "isMaster", "ismaster", "buildInfo", "endSessions", "explain"}
+
+REQUEST_LATENCY = Histogram(
+    "hrms_http_request_duration_seconds", "HTTP request latency",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "hrms_http_requests_in_progress", "HTTP requests being served",
+    multiprocess_mode="livesum",
+)
+MONGO_COMMAND_LATENCY = Histogram(
+    "hrms_mongo_command_duration_seconds", "MongoDB command latency",
+    ["collection", "command", "outcome"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+MONGO_POOL_CONNECTIONS = Gauge(
+    "hrms_mongo_pool_connections", "Pooled MongoDB connections, open or checked out",
+    ["state"], multiprocess_mode="livesum",
+)
+MONGO_POOL_CHECKOUT_WAIT = Histogram(
+    "hrms_mongo_pool_checkout_wait_seconds", "Time spent waiting to check out a pooled connection",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "hrms_mongo_pool_checkout_failures", "Failed connection check-outs", ["reason"],
+)
+CACHE_REQUESTS = Counter(
+    "hrms_cache_requests", "Response cache lookups", ["result"],
+)
+
+_open_connections = MONGO_POOL_CONNECTIONS.labels("open")
+_in_use_connections = MONGO_POOL_CONNECTIONS.labels("in_use")
+_cache_hits = CACHE_REQUESTS.labels("hit")
+_cache_misses = CACHE_REQUESTS.labels("miss")
+
+
+def record_cache_lookup(hit):
+    (_cache_hits if hit else _cache_misses).inc()
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Observe the latency of every MongoDB command, by collection."""
+
+    def __init__(self):
+        # The collection is only known from the started event.
+        self._collections = {}
+
+    def started(self, event):
+        collection = "-"
+        if event.command_name not in DATABASE_COMMANDS:
+            value = event.command.get(event.command_name)
+            if isinstance(value, str):
+                collection = value
+        self._collections[(event.connection_id, event.request_id)] = collection
+
+    def succeeded(self, event):
+        self._observe(event, "succeeded")
+
+    def failed(self, event):
+        self._observe(event, "failed")
+
+    def _observe(self, event, outcome):
+        collection = self._collections.pop((event.connection_id, event.request_id), "-")
+        MONGO_COMMAND_LATENCY.labels(collection, event.command_name, outcome).observe(
+            event.duration_micros / 1_000_000
+        )
+
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    """Track open and checked-out connections and check-out wait times."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        _open_connections.inc()
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        _open_connections.dec()
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        self._local.started = None
+        MONGO_POOL_CHECKOUT_FAILURES.labels(event.reason).inc()
+
+    def connection_checked_out(self, event):
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        if started is not None:
+            MONGO_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+        _in_use_connections.inc()
+
+    def connection_checked_in(self, event):
+        _in_use_connections.dec()
+
+
+def metrics_response_body():
+    """Return the exposition body: this process's metrics, or every worker's."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
@@ -0,0 +1,173 @@
+"""
+Middleware for the HRMS API.
+"""
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.utils.decorators import sync_and_async_middleware
+
+from . import mongo
+from .compression import compress_response
+from .exceptions import QueryBudgetExceeded
+from .metrics import REQUEST_LATENCY, REQUESTS_IN_PROGRESS
+from .monitoring import RequestQueryStats, current_request_queries
+
+logger = logging.getLogger(__name__)
+
+
+# Probes must answer while another request is connecting: the readiness check
+# reports a worker without a connection as not ready, and liveness needs none.
+CONNECTION_EXEMPT_PREFIXES = ("/healthz/",)
+
+
+def _needs_connection(request):
+    return not request.path_info.startswith(CONNECTION_EXEMPT_PREFIXES)
+
+
+@sync_and_async_middleware
+def mongo_connection_middleware(get_response):
+    """
+    Make sure this process has its own MongoDB connection before a request.
+
+    Workers normally connect at boot (gunicorn's post_worker_init hook or the
+    ASGI lifespan startup); this covers every other server and any fork that
+    skipped those hooks. Once connected it costs a PID comparison. Health
+    probes skip it, so they never wait on the connection lock.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            if not mongo.is_connected() and _needs_connection(request):
+                await sync_to_async(mongo.ensure_connected)()
+            return await get_response(request)
+    else:
+        def middleware(request):
+            if _needs_connection(request):
+                mongo.ensure_connected()
+            return get_response(request)
+
+    return middleware
+
+
+def _finish_query_tracking(request, response, stats):
+    """Report a request's MongoDB commands and enforce HRMS_QUERY_BUDGET."""
+    timing = f'db;dur={stats.total_ms:.2f};desc="{stats.count} queries"'
+    if stats.slowest_command:
+        timing += f', db-slowest;dur={stats.slowest_ms:.2f};desc="{stats.slowest_command}"'
+    existing = response.get("Server-Timing")
+    response["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+
+    fields = {
+        "path": request.path,
+        "method": request.method,
+        "status": response.status_code,
+        "db_queries": stats.count,
+        "db_time_ms": round(stats.total_ms, 2),
+        "db_slowest_ms": round(stats.slowest_ms, 2),
+        "db_slowest_command": stats.slowest_command,
+    }
+    logger.debug(
+        f"{request.method} {request.path}: {stats.count} MongoDB commands in {stats.total_ms:.1f} ms",
+        extra=fields
+    )
+
+    budget = settings.HRMS_QUERY_BUDGET
+    if budget is None or stats.count <= budget:
+        return
+    message = (
+        f"{request.method} {request.path} issued {stats.count} MongoDB commands, "
+        f"more than HRMS_QUERY_BUDGET ({budget})"
+    )
+    if settings.HRMS_QUERY_BUDGET_ACTION == "raise":
+        raise QueryBudgetExceeded(message)
+    logger.warning(message, extra=fields)
+
+
+@sync_and_async_middleware
+def query_instrumentation_middleware(get_response):
+    """
+    Count the MongoDB commands each request issues and how long they take.
+
+    The totals and the slowest command go into a ``Server-Timing`` header and
+    the ``extra`` fields of a log record. A request issuing more commands than
+    ``HRMS_QUERY_BUDGET`` is logged, or fails with QueryBudgetExceeded when
+    ``HRMS_QUERY_BUDGET_ACTION`` is ``raise`` (use that in tests to catch N+1
+    queries). Commands run while a streaming response is being sent are not
+    counted.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            stats = RequestQueryStats()
+            token = current_request_queries.set(stats)
+            try:
+                response = await get_response(request)
+            finally:
+                current_request_queries.reset(token)
+            _finish_query_tracking(request, response, stats)
+            return response
+    else:
+        def middleware(request):
+            stats = RequestQueryStats()
+            token = current_request_queries.set(stats)
+            try:
+                response = get_response(request)
+            finally:
+                current_request_queries.reset(token)
+            _finish_query_tracking(request, response, stats)
+            return response
+
+    return middleware
+
+
+def _route(request):
+    """URL pattern the request matched, so paths with IDs share one label."""
+    match = getattr(request, "resolver_match", None)
+    return match.route if match is not None else "unmatched"
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """
+    Record the latency of every request per route, method and status, and
+    the number of requests in progress (see hrms.metrics).
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            REQUESTS_IN_PROGRESS.inc()
+            start = time.perf_counter()
+            try:
+                response = await get_response(request)
+            finally:
+                REQUESTS_IN_PROGRESS.dec()
+            REQUEST_LATENCY.labels(request.method, _route(request), response.status_code).observe(
+                time.perf_counter() - start
+            )
+            return response
+    else:
+        def middleware(request):
+            REQUESTS_IN_PROGRESS.inc()
+            start = time.perf_counter()
+            try:
+                response = get_response(request)
+            finally:
+                REQUESTS_IN_PROGRESS.dec()
+            REQUEST_LATENCY.labels(request.method, _route(request), response.status_code).observe(
+                time.perf_counter() - start
+            )
+            return response
+
+    return middleware
+
+
+@sync_and_async_middleware
+def compression_middleware(get_response):
+    """Compress responses with gzip or brotli as negotiated (see hrms.compression)."""
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            return compress_response(request, await get_response(request))
+    else:
+        def middleware(request):
+            return compress_response(request, get_response(request))
+
+    return middleware
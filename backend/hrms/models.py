@@ -1,14 +1,87 @@
+from datetime import datetime, time
+
 import mongoengine as me
 
+
+def mongo_date(value):
+    """Convert a date to the midnight datetime mongoengine stores for a DateField."""
+    return datetime.combine(value, time.min)
+
+
+def normalize_search_text(value):
+    """Normalize text for case-insensitive prefix search."""
+    return " ".join((value or "").casefold().split())
+
+
+# Search terms are indexed by their prefixes up to this many characters, so a
+# search is an equality match that the (search_prefixes, -_id) index returns
+# newest first, without an in-memory sort. Longer queries also carry an
+# anchored regex on search_terms, whose index narrows them down when the
+# first SEARCH_PREFIX_LENGTH characters are common (e.g. a shared email
+# prefix).
+SEARCH_PREFIX_LENGTH = 8
+
+
+def employee_search_terms(employee_id, full_name, email, department):
+    """
+    Return the normalized terms an employee can be found by.
+
+    Each field is included whole, and multi-word names and departments also
+    word by word, so "smi" finds "John Smith".
+    """
+    terms = []
+    for value in (employee_id, full_name, email, department):
+        value = normalize_search_text(value)
+        if value:
+            terms.append(value)
+            terms.extend(value.split(" ")[1:])
+    return sorted(set(terms))
+
+
+def employee_search_prefixes(terms):
+    """Return the prefixes of ``terms``, up to SEARCH_PREFIX_LENGTH characters."""
+    return sorted({
+        term[:length] for term in terms for length in range(1, min(len(term), SEARCH_PREFIX_LENGTH) + 1)
+    })
+
+
 class Employee(me.Document):
     employee_id = me.StringField(required=True, unique=True)
     full_name = me.StringField(required=True)
     email = me.EmailField(required=True, unique=True)
     department = me.StringField(required=True)
 
+    # Maintained incrementally by the attendance write paths (hrms.rollups).
+    present_count = me.IntField(default=0)
+    absent_count = me.IntField(default=0)
+    # Bumped whenever the employee's attendance changes; drives ETags.
+    version = me.IntField(default=0)
+    updated_at = me.DateTimeField()
+
     created_at = me.DateTimeField()
 
-    meta = {"collection": "employees"}
+    # Lowercased prefix-search keys and their indexed prefixes, derived in
+    # clean(); see employee_search_terms() and employee_search_prefixes().
+    search_terms = me.ListField(me.StringField())
+    search_prefixes = me.ListField(me.StringField())
+
+    meta = {
+        "collection": "employees",
+        "indexes": [
+            ("search_prefixes", "-id"),
+            ("department", "search_prefixes", "-id"),
+            "search_terms",
+            ("department", "-id"),
+        ],
+        # Built in the background at startup, see hrms.indexes.
+        "auto_create_index": False,
+    }
+
+    def clean(self):
+        self.search_terms = employee_search_terms(
+            self.employee_id, self.full_name, self.email, self.department
+        )
+        self.search_prefixes = employee_search_prefixes(self.search_terms)
 
 class Attendance(me.Document):
     employee = me.ReferenceField(Employee, required=True, reverse_delete_rule=me.CASCADE)
@@ -18,6 +91,33 @@ class Attendance(me.Document):
     meta = {
         "collection": "attendance",
         "indexes": [
-            {"fields": ["employee", "date"], "unique": True}
-        ]
+            # Upserts, per-employee history and date ranges, newest first.
+            {"fields": ["employee", "date"], "unique": True},
+            # Covered per-employee Present/Absent counts (attendance_counts).
+            ("employee", "status"),
+            # Covered per-day Present/Absent counts (rebuild_daily_stats).
+            ("date", "status"),
+        ],
+        # Built in the background at startup, see hrms.indexes.
+        "auto_create_index": False,
     }
+
+
+class DailyAttendanceStats(me.Document):
+    """Per-date attendance totals, maintained incrementally by the write paths."""
+    date = me.DateField(primary_key=True)
+    present = me.IntField(default=0)
+    absent = me.IntField(default=0)
+
+    meta = {"collection": "daily_attendance_stats", "auto_create_index": False}
+
+
+class Counter(me.Document):
+    """Named organisation-wide counter, e.g. the total number of employees."""
+    name = me.StringField(primary_key=True)
+    value = me.IntField(default=0)
+    # Bumped on every change to the data the counter summarises; drives ETags.
+    version = me.IntField(default=0)
+    updated_at = me.DateTimeField()
+
+    meta = {"collection": "counters", "auto_create_index": False}
@@ -1,51 +1,228 @@
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import mongoengine as me
+import pymongo
+from mongoengine import connection as me_connection
+from django.conf import settings
 from dotenv import load_dotenv
 import logging
 
+from .indexes import ensure_all_indexes, ensure_unique_indexes
+from .monitoring import get_event_listeners, get_pool_monitor
+from .rollups import seed_employee_total
+
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
-def connect_mongo():
+DEFAULT_SLOW_COMMAND_MS = 100
+DEFAULT_BOOT_TIMEOUT_MS = 5000
+
+# Delay between attempts of the boot tasks while MongoDB is unreachable, in
+# seconds, doubling up to the maximum.
+BOOT_RETRY_SECONDS = 1
+MAX_BOOT_RETRY_SECONDS = 30
+
+# PID of the process that owns the current connection; a different PID means
+# we are in a forked child holding the parent's MongoClient.
+_connected_pid = None
+_connect_lock = threading.Lock()
+
+# PID of the process that started the boot tasks, so a forked child starts
+# its own.
+_boot_pid = None
+_boot_lock = threading.Lock()
+
+
+def client_options(client="default"):
+    """
+    Return the MongoClient keyword arguments shared by every HRMS client.
+
+    Combines the pool and timeout settings from ``MONGO_CLIENT_OPTIONS`` (unset
+    values are left to the driver) with the monitoring listeners of the client
+    named ``client`` (see hrms.monitoring.get_pool_monitor).
+    """
+    options = {
+        name: value
+        for name, value in getattr(settings, "MONGO_CLIENT_OPTIONS", {}).items()
+        if value is not None
+    }
+    options["event_listeners"] = get_event_listeners(
+        getattr(settings, "MONGO_SLOW_COMMAND_MS", DEFAULT_SLOW_COMMAND_MS), client
+    )
+    return options
+
+
+def warm_connection_count():
+    """Return MONGO_WARM_CONNECTIONS, defaulting to minPoolSize (at least 1)."""
+    count = getattr(settings, "MONGO_WARM_CONNECTIONS", None)
+    if count is None:
+        count = max(getattr(settings, "MONGO_CLIENT_OPTIONS", {}).get("minPoolSize") or 0, 1)
+    return count
+
+
+def boot_timeout():
+    """Return MONGO_BOOT_TIMEOUT_MS in seconds."""
+    return getattr(settings, "MONGO_BOOT_TIMEOUT_MS", DEFAULT_BOOT_TIMEOUT_MS) / 1000
+
+
+def _ping(client, timeout):
+    with pymongo.timeout(timeout):
+        client.admin.command("ping")
+
+
+def warm_up(client, connections):
+    """
+    Open ``connections`` pooled connections by running concurrent pings.
+
+    Server discovery, the TCP/TLS handshake and authentication then happen at
+    boot instead of on the first requests. The pings give up after
+    MONGO_BOOT_TIMEOUT_MS rather than the server selection timeout, and
+    failures are logged, not raised, so a worker still starts quickly while
+    MongoDB is unreachable.
+    """
+    timeout = boot_timeout()
+    try:
+        if connections <= 1:
+            _ping(client, timeout)
+        else:
+            with ThreadPoolExecutor(max_workers=connections) as pool:
+                list(pool.map(lambda _: _ping(client, timeout), range(connections)))
+        logger.info(f"Warmed up {connections} MongoDB connection(s)")
+    except Exception as e:
+        logger.warning(f"MongoDB warm-up failed, connecting on first use: {str(e)}")
+
+
+def connect_mongo(warm=True):
     """
     Connect to MongoDB instance with comprehensive error handling.
-    
+
+    Args:
+        warm: Open pooled connections right away (see warm_up)
+
     Raises:
         ConnectionError: If MongoDB connection fails
         ValueError: If MONGO_URI environment variable is not set
     """
+    global _connected_pid
     try:
-        print(os.getenv('DEBUG'))
-        print(os.getenv('MONGO_URI'))
-        print(os.getenv('SECRET_KEY'))
         mongo_uri = os.getenv("MONGO_URI")
-        
+
         if not mongo_uri:
             error_msg = "MONGO_URI environment variable is not set"
             logger.error(error_msg)
             raise ValueError(error_msg)
-        
+
         logger.info('Attempting to connect to MongoDB')
-        me.connect(host=mongo_uri)
+        client = me.connect(host=mongo_uri, **client_options())
         logger.info('Successfully connected to MongoDB database')
-        
+        _connected_pid = os.getpid()
+
+        if warm:
+            warm_up(client, warm_connection_count())
+
     except ValueError as ve:
         logger.error(f"Configuration error: {str(ve)}")
         raise
-        
+
     except me.ConnectionFailure as ce:
         error_msg = f"Failed to connect to MongoDB: {str(ce)}"
         logger.error(error_msg)
         raise ConnectionError(error_msg) from ce
-        
+
     except me.ServerSelectionTimeoutError as ste:
         error_msg = f"MongoDB connection timeout: {str(ste)}"
         logger.error(error_msg)
         raise ConnectionError(error_msg) from ste
-        
+
     except Exception as e:
         error_msg = f"Unexpected error connecting to MongoDB: {str(e)}"
         logger.error(error_msg)
         raise ConnectionError(error_msg) from e
 
+
+def _forget_inherited_connection():
+    """
+    Drop the MongoClient inherited from the parent process without closing it.
+
+    Closing it would end sessions and shut connections the parent still uses.
+    Removing it from mongoengine's registry first makes disconnect() only
+    detach the cached collections and the connection settings.
+    """
+    me_connection._connections.pop(me_connection.DEFAULT_CONNECTION_NAME, None)
+    me.disconnect()
+    # The parent's check-outs are not ours to count.
+    get_pool_monitor().reset()
+
+
+def is_connected():
+    """Return True if this process (not a parent it was forked from) is connected."""
+    return _connected_pid == os.getpid()
+
+
+def _retry(task, description):
+    """Call ``task`` until it succeeds, backing off between attempts."""
+    delay = BOOT_RETRY_SECONDS
+    while True:
+        try:
+            return task()
+        except Exception as e:
+            logger.warning(f"Failed to {description}, retrying in {delay}s: {str(e)}")
+            time.sleep(delay)
+            delay = min(delay * 2, MAX_BOOT_RETRY_SECONDS)
+
+
+def start_boot_tasks():
+    """
+    Prepare the database for this process in a daemon thread, once per process.
+
+    The unique indexes are built first; until they exist the readiness check
+    reports the worker as not ready. Then the employee headcount is seeded
+    (until then it is counted on each read) and, with HRMS_ENSURE_INDEXES, the
+    other missing indexes are built. The first two steps are retried until
+    MongoDB answers, so a worker booted during an outage recovers by itself
+    instead of blocking its boot.
+    """
+    global _boot_pid
+    with _boot_lock:
+        if _boot_pid == os.getpid():
+            return
+        _boot_pid = os.getpid()
+
+    def run():
+        _retry(ensure_unique_indexes, "build the unique MongoDB indexes")
+        _retry(seed_employee_total, "seed the employee counter")
+        if not getattr(settings, "HRMS_ENSURE_INDEXES", True):
+            return
+        try:
+            ensure_all_indexes()
+            logger.info("MongoDB indexes are in place")
+        except Exception as e:
+            logger.error(f"Failed to ensure MongoDB indexes, run manage.py ensure_indexes: {str(e)}")
+
+    threading.Thread(target=run, name="hrms-boot", daemon=True).start()
+
+
+def ensure_connected(warm=True):
+    """
+    Connect this process to MongoDB unless it already owns a connection.
+
+    Safe to call on every request: after the first call it is a PID check. In
+    a forked child (e.g. a gunicorn worker with ``--preload``) the parent's
+    client is dropped and a new one is created for the child. Creating the
+    client does not wait for MongoDB and the warm-up is bounded by
+    MONGO_BOOT_TIMEOUT_MS, so this returns quickly even during an outage; the
+    indexes and the headcount are prepared by start_boot_tasks().
+    """
+    if is_connected():
+        return
+    with _connect_lock:
+        if is_connected():
+            return
+        if _connected_pid is not None:
+            logger.info(f"Process {os.getpid()} was forked from {_connected_pid}, reconnecting to MongoDB")
+            _forget_inherited_connection()
+        connect_mongo(warm=warm)
+        start_boot_tasks()
@@ -0,0 +1,254 @@
+"""
+PyMongo monitoring listeners for the connection pool and MongoDB commands.
+
+hrms.mongo registers these listeners on every client it creates:
+
+* PoolMonitor tracks open and checked-out connections, per server pool, and
+  how long requests wait to check one out, which shows when ``maxPoolSize``
+  is too small. Each client (mongoengine's and Motor's) has its own;
+* SlowCommandLogger logs every command slower than ``MONGO_SLOW_COMMAND_MS``;
+* RequestCommandTracker attributes commands to the request being served, for
+  hrms.middleware.query_instrumentation_middleware;
+* the listeners in hrms.metrics feed the Prometheus metrics.
+
+The pool counters are per process; read them with pool_stats().
+"""
+from contextvars import ContextVar
+import logging
+import threading
+import time
+
+from pymongo import monitoring
+from pymongo.common import MAX_POOL_SIZE
+
+from .metrics import MongoCommandMetrics, MongoPoolMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Aggregate the connection pool events of one MongoClient.
+
+    The client keeps one pool per server, each bounded by ``maxPoolSize``, so
+    open and checked-out connections are also counted per server address.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Check-out start times, per thread (a check-out never changes thread).
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.open_connections = 0
+            self.in_use = 0
+            self.max_in_use = 0
+            self.checkouts = 0
+            self.checkout_failures = {}
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.pool_clears = 0
+            self.pools = {}
+
+    def _wait_time(self):
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        return time.perf_counter() - started if started is not None else 0.0
+
+    def _pool(self, address):
+        """Return the counters of the pool for ``address``; call with the lock held."""
+        pool = self.pools.get(address)
+        if pool is None:
+            pool = self.pools[address] = {
+                "open_connections": 0, "in_use": 0, "max_pool_size": MAX_POOL_SIZE,
+            }
+        return pool
+
+    def pool_created(self, event):
+        with self._lock:
+            # Options are only reported when they differ from the defaults.
+            self._pool(event.address)["max_pool_size"] = event.options.get("maxPoolSize", MAX_POOL_SIZE)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+        logger.warning(f"MongoDB connection pool for {event.address} was cleared")
+
+    def pool_closed(self, event):
+        with self._lock:
+            self.pools.pop(event.address, None)
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+            self._pool(event.address)["open_connections"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections -= 1
+            if event.address in self.pools:
+                self.pools[event.address]["open_connections"] -= 1
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        waited = self._wait_time()
+        with self._lock:
+            self.checkout_failures[event.reason] = self.checkout_failures.get(event.reason, 0) + 1
+        logger.warning(
+            f"MongoDB connection check-out from {event.address} failed after "
+            f"{waited * 1000:.1f} ms: {event.reason}"
+        )
+
+    def connection_checked_out(self, event):
+        waited = self._wait_time()
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self._pool(event.address)["in_use"] += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use -= 1
+            if event.address in self.pools:
+                self.pools[event.address]["in_use"] -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "open_connections": self.open_connections,
+                "in_use": self.in_use,
+                "max_in_use": self.max_in_use,
+                "checkouts": self.checkouts,
+                "checkout_failures": dict(self.checkout_failures),
+                "checkout_wait_ms": {
+                    "avg": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else None,
+                    "max": round(self.wait_max * 1000, 3),
+                },
+                "pool_clears": self.pool_clears,
+                "pools": {f"{host}:{port}": dict(pool) for (host, port), pool in self.pools.items()},
+            }
+
+
+class SlowCommandLogger(monitoring.CommandListener):
+    """Log commands that take longer than ``threshold_ms``."""
+
+    def __init__(self, threshold_ms):
+        self.threshold_ms = threshold_ms
+        self._lock = threading.Lock()
+        self.slow_commands = 0
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._check(event, "succeeded")
+
+    def failed(self, event):
+        self._check(event, "failed")
+
+    def _check(self, event, outcome):
+        duration_ms = event.duration_micros / 1000
+        if duration_ms < self.threshold_ms:
+            return
+        with self._lock:
+            self.slow_commands += 1
+        logger.warning(
+            f"Slow MongoDB command {event.command_name} on {event.database_name} "
+            f"{outcome} in {duration_ms:.1f} ms (request {event.request_id})"
+        )
+
+
+class RequestQueryStats:
+    """MongoDB commands issued while serving one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_command = None
+        self._lock = threading.Lock()
+
+    def add(self, command_name, duration_ms):
+        # Motor runs commands on executor threads, so guard the updates.
+        with self._lock:
+            self.count += 1
+            self.total_ms += duration_ms
+            if duration_ms >= self.slowest_ms:
+                self.slowest_ms = duration_ms
+                self.slowest_command = command_name
+
+
+# Stats of the request being served by the current thread or task. Motor
+# copies the context into its executor threads, so async views are counted too.
+current_request_queries = ContextVar("current_request_queries", default=None)
+
+
+class RequestCommandTracker(monitoring.CommandListener):
+    """Add every finished command to the current request's RequestQueryStats."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event)
+
+    def failed(self, event):
+        self._record(event)
+
+    def _record(self, event):
+        stats = current_request_queries.get()
+        if stats is not None:
+            stats.add(event.command_name, event.duration_micros / 1000)
+
+
+_pool_monitors = {}
+_pool_monitors_lock = threading.Lock()
+request_command_tracker = RequestCommandTracker()
+_metric_listeners = [MongoCommandMetrics(), MongoPoolMetrics()]
+_slow_command_logger = None
+
+
+def get_pool_monitor(client="default"):
+    """Return the PoolMonitor of a client: ``default`` (mongoengine) or ``async`` (Motor)."""
+    with _pool_monitors_lock:
+        if client not in _pool_monitors:
+            _pool_monitors[client] = PoolMonitor()
+        return _pool_monitors[client]
+
+
+def get_pool_monitors():
+    """Return a dictionary of every client's PoolMonitor, by client name."""
+    with _pool_monitors_lock:
+        return dict(_pool_monitors)
+
+
+def get_event_listeners(slow_command_ms, client="default"):
+    """Return the listeners to register on the MongoClient named ``client``."""
+    global _slow_command_logger
+    if _slow_command_logger is None:
+        _slow_command_logger = SlowCommandLogger(slow_command_ms)
+    return [get_pool_monitor(client), _slow_command_logger, request_command_tracker, *_metric_listeners]
+
+
+def pool_stats():
+    """Return this process's connection pool and slow command counters."""
+    monitors = get_pool_monitors()
+    stats = get_pool_monitor().stats()
+    if "async" in monitors:
+        stats["async"] = monitors["async"].stats()
+    stats["slow_commands"] = _slow_command_logger.slow_commands if _slow_command_logger else 0
+    stats["slow_command_threshold_ms"] = _slow_command_logger.threshold_ms if _slow_command_logger else None
+    return stats
@@ -0,0 +1,87 @@
+"""
+Process-local employee_id -> ObjectId resolver.
+
+Marking attendance only needs the ``_id`` of the employee, but every request
+used to look the employee up by ``employee_id`` first. The resolver keeps the
+mapping in an LRUCache (hrms.cache) bounded by
+``HRMS_EMPLOYEE_RESOLVER_MAX_ENTRIES`` and ``HRMS_EMPLOYEE_RESOLVER_TTL``
+seconds, so repeated writes for the same employees skip that round trip.
+
+Only existing employees are cached; an unknown ID is looked up again on every
+call, so a new employee resolves immediately. delete_employee and
+create_employee forget the ID in their own worker. Other workers may still
+resolve a deleted (or deleted and re-created) employee to its old ``_id`` for
+up to the TTL, the same window the local response cache has; set the TTL to 0
+to disable the cache. Attendance written in that window is not kept: the
+employee rollup update matches no document (see
+hrms.rollups.record_attendance_changes), so the write paths delete the record,
+forget the ID and report the employee as not found.
+"""
+import threading
+
+from django.conf import settings
+
+from .cache import MISSING, LRUCache
+from .models import Employee
+
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_TTL = 30
+
+
+class EmployeeResolver:
+    """Resolve employee IDs to Employee ``_id`` values through an LRU cache."""
+
+    def __init__(self, max_entries, ttl):
+        self._cache = LRUCache(max_entries, ttl)
+
+    def resolve(self, employee_id):
+        """Return the ObjectId of ``employee_id``, or None if it does not exist."""
+        return self.resolve_many([employee_id]).get(employee_id)
+
+    def resolve_many(self, employee_ids):
+        """
+        Resolve many employee IDs with at most one query.
+
+        Args:
+            employee_ids: Iterable of employee IDs
+
+        Returns:
+            Dictionary mapping each existing employee ID to its ObjectId;
+            unknown IDs are left out
+        """
+        resolved = {}
+        missing = set()
+        for employee_id in employee_ids:
+            oid = self._cache.get(employee_id, MISSING)
+            if oid is MISSING:
+                missing.add(employee_id)
+            else:
+                resolved[employee_id] = oid
+        if missing:
+            for doc in Employee.objects(employee_id__in=list(missing)).only("employee_id").as_pymongo():
+                self._cache.set(doc["employee_id"], doc["_id"])
+                resolved[doc["employee_id"]] = doc["_id"]
+        return resolved
+
+    def forget(self, employee_id):
+        self._cache.delete(employee_id)
+
+    def clear(self):
+        self._cache.clear()
+
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def get_employee_resolver():
+    """Return the process-wide EmployeeResolver."""
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = EmployeeResolver(
+                    getattr(settings, "HRMS_EMPLOYEE_RESOLVER_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+                    getattr(settings, "HRMS_EMPLOYEE_RESOLVER_TTL", DEFAULT_TTL),
+                )
+    return _resolver
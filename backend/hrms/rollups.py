@@ -0,0 +1,300 @@
+"""
+Incrementally maintained attendance rollups.
+
+``daily_attendance_stats`` holds one document per date with the number of
+Present and Absent records, the ``employees`` counter holds the headcount, and
+every Employee carries its own ``present_count``/``absent_count``. Write paths
+call the ``record_*`` helpers right after their own write, so read paths fetch
+these documents instead of counting the attendance collection.
+
+Rollup updates never fail the request that triggered them: errors are logged
+and the ``rebuild_attendance_stats`` / ``check_attendance_counters``
+management commands repair any drift.
+"""
+from collections import defaultdict
+from datetime import datetime
+import logging
+
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from .models import Attendance, Counter, DailyAttendanceStats, Employee, mongo_date
+
+logger = logging.getLogger(__name__)
+
+EMPLOYEE_COUNTER = "employees"
+STATUS_FIELDS = {"Present": "present", "Absent": "absent"}
+
+# Present/Absent per date. Sorting on the group key lets the planner read the
+# (date, status) index alone (a covered scan) instead of every document.
+DAILY_STATS_PIPELINE = [
+    {"$sort": {"date": 1}},
+    {
+        "$group": {
+            "_id": "$date",
+            "present": {"$sum": {"$cond": [{"$eq": ["$status", "Present"]}, 1, 0]}},
+            "absent": {"$sum": {"$cond": [{"$eq": ["$status", "Absent"]}, 1, 0]}},
+        }
+    },
+]
+
+
+def _status_delta(old_status, new_status):
+    """Return the ``$inc`` document for a status transition (None = no record)."""
+    inc = defaultdict(int)
+    if old_status == new_status:
+        return inc
+    if old_status:
+        inc[STATUS_FIELDS[old_status]] -= 1
+    if new_status:
+        inc[STATUS_FIELDS[new_status]] += 1
+    return inc
+
+
+def record_attendance_changes(changes):
+    """
+    Apply attendance status transitions to the daily and per-employee rollups.
+
+    The per-employee ``$inc`` doubles as an existence check: an employee it
+    matches no document for was deleted after the caller resolved its ID, so
+    that employee's changes are left out of the daily rollups as well.
+
+    Args:
+        changes: Iterable of (employee ObjectId, date, old_status, new_status)
+            tuples, where a status of None means the record did not exist
+            (before) or was removed (after)
+
+    Returns:
+        Set of the employee ObjectIds that no longer exist; the caller should
+        remove the attendance it wrote for them
+    """
+    changes = list(changes)
+    per_employee = defaultdict(lambda: defaultdict(int))
+    for emp_oid, day, old_status, new_status in changes:
+        for field, delta in _status_delta(old_status, new_status).items():
+            per_employee[emp_oid][f"{field}_count"] += delta
+
+    updated, matched = _apply_increments(Employee, per_employee, upsert=False, touch=True)
+    missing = set()
+    if matched is not None and matched < len(updated):
+        try:
+            found = Employee._get_collection().distinct("_id", {"_id": {"$in": updated}})
+            missing = set(updated) - set(found)
+        except Exception as e:
+            logger.error(f"Failed to look up employees missing from the rollups: {str(e)}")
+    if len(updated) > len(missing):
+        # Attendance counts are part of the employee list as well.
+        _touch_employee_counter()
+
+    per_day = defaultdict(lambda: defaultdict(int))
+    for emp_oid, day, old_status, new_status in changes:
+        if emp_oid in missing:
+            continue
+        for field, delta in _status_delta(old_status, new_status).items():
+            per_day[day][field] += delta
+    _apply_increments(DailyAttendanceStats, {mongo_date(day): inc for day, inc in per_day.items()}, upsert=True)
+    return missing
+
+
+def _apply_increments(document, increments, upsert, touch=False):
+    """
+    Run one unordered bulk_write of ``$inc`` updates keyed by ``_id``.
+
+    With ``touch`` each updated document also gets its ``version`` bumped and
+    ``updated_at`` set, in the same update.
+
+    Returns:
+        Tuple of (keys an update was sent for, number of documents matched);
+        the count is None if the write failed
+    """
+    now = datetime.utcnow()
+    keys = []
+    operations = []
+    for key, inc in increments.items():
+        if not any(inc.values()):
+            continue
+        update = {"$inc": dict(inc)}
+        if touch:
+            update["$inc"]["version"] = 1
+            update["$set"] = {"updated_at": now}
+        keys.append(key)
+        operations.append(UpdateOne({"_id": key}, update, upsert=upsert))
+    if not operations:
+        return keys, 0
+
+    try:
+        result = document._get_collection().bulk_write(operations, ordered=False)
+        return keys, result.matched_count + len(result.upserted_ids)
+    except Exception as e:
+        logger.error(
+            f"Failed to update {document._meta['collection']} rollups, "
+            f"run rebuild_attendance_stats/check_attendance_counters: {str(e)}"
+        )
+        return keys, None
+
+
+def _touch_employee_counter(inc=None):
+    """
+    Bump the employees counter version, optionally adjusting the headcount.
+
+    The version is always bumped, creating the document if needed, so the
+    employee list ETag changes with every write. The headcount is only
+    adjusted once it has been seeded (see seed_employee_total).
+    """
+    counters = Counter._get_collection()
+    update = {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}}
+    try:
+        if inc:
+            seeded = counters.update_one(
+                {"_id": EMPLOYEE_COUNTER, "value": {"$exists": True}},
+                {**update, "$inc": {**inc, "version": 1}}
+            )
+            if seeded.matched_count:
+                return
+        try:
+            counters.update_one({"_id": EMPLOYEE_COUNTER}, update, upsert=True)
+        except DuplicateKeyError:
+            # A concurrent write created it first.
+            counters.update_one({"_id": EMPLOYEE_COUNTER}, update)
+    except Exception as e:
+        logger.error(f"Failed to update employee counter, run rebuild_attendance_stats: {str(e)}")
+
+
+def record_attendance_change(emp_oid, day, old_status, new_status):
+    """
+    Apply a single attendance status transition to the rollups.
+
+    Returns:
+        False if the employee no longer exists, otherwise True
+    """
+    return not record_attendance_changes([(emp_oid, day, old_status, new_status)])
+
+
+def record_employees_added(count=1):
+    """
+    Adjust the employee headcount by count (negative to remove).
+
+    The counter is only adjusted once it has been seeded by
+    seed_employee_total() or a rebuild, so it never starts from zero on an
+    existing database.
+    """
+    if count:
+        _touch_employee_counter({"value": count})
+
+
+def record_employee_deleted(emp_oid):
+    """
+    Delete a deleted employee's attendance and its contribution to the rollups.
+
+    Called after the employee document is removed, so marks racing with the
+    delete no longer reach the rollups (record_attendance_changes() skips
+    missing employees). The decrements are then taken from an aggregate of the
+    attendance that is left, which includes anything marked since the request
+    started. A mark whose record lands before the employee is removed but
+    whose rollup update runs after can still skew the daily totals by one;
+    ``manage.py rebuild_attendance_stats`` repairs that.
+
+    Args:
+        emp_oid: ObjectId of the deleted employee
+    """
+    attendance = Attendance._get_collection()
+    increments = defaultdict(lambda: defaultdict(int))
+    for group in attendance.aggregate([
+        {"$match": {"employee": emp_oid}},
+        {"$group": {"_id": {"date": "$date", "status": "$status"}, "count": {"$sum": 1}}},
+    ]):
+        field = STATUS_FIELDS.get(group["_id"]["status"])
+        if field:
+            increments[group["_id"]["date"]][field] -= group["count"]
+    attendance.delete_many({"employee": emp_oid})
+
+    # The employee document itself is gone, so only the daily rollups need
+    # adjusting.
+    _apply_increments(DailyAttendanceStats, increments, upsert=True)
+    record_employees_added(-1)
+
+
+def seed_employee_total():
+    """
+    Seed the headcount with a count of the employees, unless it is seeded.
+
+    Runs once per worker after it connects (hrms.mongo.start_boot_tasks) and
+    in rebuild_daily_stats(), never on a request: a count followed by a seed
+    races with concurrent creates and deletes, so request paths only ``$inc``
+    a seeded counter.
+
+    Returns:
+        The headcount
+    """
+    counters = Counter._get_collection()
+    counter = counters.find_one({"_id": EMPLOYEE_COUNTER})
+    if counter is not None and "value" in counter:
+        return counter["value"]
+
+    total = Employee.objects.count()
+    try:
+        counters.update_one(
+            {"_id": EMPLOYEE_COUNTER, "value": {"$exists": False}},
+            {
+                "$set": {"value": total},
+                "$setOnInsert": {"version": 0, "updated_at": datetime.utcnow()},
+            },
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # Another worker seeded it first.
+        return counters.find_one({"_id": EMPLOYEE_COUNTER})["value"]
+    return total
+
+
+def employee_total():
+    """Return the headcount, counting the employees until the counter is seeded."""
+    counter = Counter._get_collection().find_one({"_id": EMPLOYEE_COUNTER}, {"value": 1})
+    if counter is not None and "value" in counter:
+        return counter["value"]
+    return Employee.objects.count()
+
+
+def daily_stats(day):
+    """Return ``{"present": int, "absent": int}`` for the given date."""
+    stats = DailyAttendanceStats._get_collection().find_one({"_id": mongo_date(day)})
+    return {
+        "present": stats.get("present", 0) if stats else 0,
+        "absent": stats.get("absent", 0) if stats else 0,
+    }
+
+
+def rebuild_daily_stats():
+    """
+    Recompute every rollup from the raw attendance and employee collections.
+
+    Returns:
+        Tuple of (number of dates rebuilt, employee headcount)
+    """
+    stats = DailyAttendanceStats._get_collection()
+    rebuilt = set()
+    batch = []
+    for row in Attendance.objects.aggregate(DAILY_STATS_PIPELINE, allowDiskUse=True):
+        rebuilt.add(row["_id"])
+        batch.append(UpdateOne(
+            {"_id": row["_id"]},
+            {"$set": {"present": row["present"], "absent": row["absent"]}},
+            upsert=True
+        ))
+        if len(batch) >= 1000:
+            stats.bulk_write(batch, ordered=False)
+            batch = []
+    if batch:
+        stats.bulk_write(batch, ordered=False)
+
+    stale = [doc["_id"] for doc in stats.find({}, {"_id": 1}) if doc["_id"] not in rebuilt]
+    if stale:
+        stats.delete_many({"_id": {"$in": stale}})
+
+    total = Employee.objects.count()
+    Counter._get_collection().update_one(
+        {"_id": EMPLOYEE_COUNTER},
+        {"$set": {"value": total, "updated_at": datetime.utcnow()}, "$inc": {"version": 1}},
+        upsert=True
+    )
+    return len(rebuilt), total
@@ -1,12 +1,21 @@
 import re
 from rest_framework import serializers
 from .models import Employee, Attendance
+from .resolver import get_employee_resolver
 import mongoengine as me
 import logging
 
 logger = logging.getLogger(__name__)
 
 class EmployeeSerializer(serializers.Serializer):
+    """
+    Validate employee data.
+
+    Uniqueness of ``employee_id`` and ``email`` is checked with one query per
+    field unless the serializer context sets ``check_unique`` to False, for
+    callers that check a whole batch at once or rely on the unique indexes
+    (create_employee and the bulk import).
+    """
     id = serializers.CharField(read_only=True)
     employee_id = serializers.CharField()
     full_name = serializers.CharField()
@@ -30,11 +39,13 @@ class EmployeeSerializer(serializers.Serializer):
             if not value or not isinstance(value, str):
                 raise serializers.ValidationError("Employee ID must be a non-empty string.")
             
-            if Employee.objects(employee_id=value).first():
+            if self.context.get("check_unique", True) and Employee.objects(employee_id=value).first():
                 logger.warning(f"Duplicate employee ID attempted: {value}")
                 raise serializers.ValidationError("Employee ID already exists.")
             
             return value
+        except serializers.ValidationError:
+            raise
         except me.ConnectionFailure as e:
             logger.error(f"Database connection error during employee_id validation: {str(e)}")
             raise serializers.ValidationError("Database error occurred. Please try again.")
@@ -59,11 +70,13 @@ class EmployeeSerializer(serializers.Serializer):
             if not value or not isinstance(value, str):
                 raise serializers.ValidationError("Email must be a non-empty string.")
             
-            if Employee.objects(email=value).first():
+            if self.context.get("check_unique", True) and Employee.objects(email=value).first():
                 logger.warning(f"Duplicate email attempted: {value}")
                 raise serializers.ValidationError("Email already exists.")
             
             return value
+        except serializers.ValidationError:
+            raise
         except me.ConnectionFailure as e:
             logger.error(f"Database connection error during email validation: {str(e)}")
             raise serializers.ValidationError("Database error occurred. Please try again.")
@@ -106,7 +119,13 @@ class EmployeeSerializer(serializers.Serializer):
         return value.strip()
 
 
-class AttendanceSerializer(serializers.Serializer):
+class AttendanceRecordSerializer(serializers.Serializer):
+    """
+    Field-level validation for an attendance record.
+
+    Does not resolve the employee, so it can be used to validate many rows
+    before resolving all their employees at once.
+    """
     id = serializers.CharField(read_only=True)
     employee_id = serializers.CharField()
     date = serializers.DateField()
@@ -151,6 +170,9 @@ class AttendanceSerializer(serializers.Serializer):
             raise serializers.ValidationError("Status must be either 'Present' or 'Absent'.")
         return value
 
+
+class AttendanceSerializer(AttendanceRecordSerializer):
+
     def validate(self, attrs):
         """
         Validate the entire attendance record.
@@ -171,11 +193,12 @@ class AttendanceSerializer(serializers.Serializer):
                 raise serializers.ValidationError({"employee_id": "Employee ID is required."})
             
             try:
-                emp = Employee.objects(employee_id=employee_id).first()
-                if not emp:
+                emp_oid = get_employee_resolver().resolve(employee_id)
+                if not emp_oid:
                     logger.warning(f"Employee not found during attendance validation: {employee_id}")
                     raise serializers.ValidationError({"employee_id": "Employee not found."})
-                attrs["employee"] = emp
+                # The employee's ObjectId; the document itself is not loaded.
+                attrs["employee"] = emp_oid
             except me.ConnectionFailure as e:
                 logger.error(f"Database connection error during employee lookup: {str(e)}")
                 raise serializers.ValidationError("Database error occurred. Please try again.")
@@ -0,0 +1,140 @@
+"""
+Base test case for tests that need MongoDB.
+
+MongoTestCase connects mongoengine to a throwaway database: the server at
+``HRMS_TEST_MONGO_URI`` when it is set, otherwise an in-memory mongomock
+client (``pip install -r requirements-dev.txt``). The tests are skipped when
+neither is available.
+
+mongomock is not thread-safe, so every collection operation is serialized
+with one lock. That mirrors a server, which applies each operation atomically
+but interleaves operations from concurrent requests freely.
+"""
+from collections import Counter
+import functools
+import os
+import threading
+from unittest import SkipTest, mock
+
+import mongoengine as me
+from django.test import SimpleTestCase
+
+from hrms import mongo
+from hrms.cache import NullCache
+from hrms.indexes import ensure_unique_indexes
+from hrms.models import Attendance, DailyAttendanceStats, Employee
+from hrms.resolver import get_employee_resolver
+
+try:
+    import mongomock
+except ImportError:
+    mongomock = None
+
+TEST_MONGO_URI = os.getenv("HRMS_TEST_MONGO_URI")
+TEST_DB = "hrms_test"
+
+# Collection methods run under the lock. find() only builds a cursor; the
+# documents are read in _get_dataset when it is iterated.
+MONGOMOCK_LOCKED_METHODS = (
+    "_get_dataset", "aggregate", "bulk_write", "count_documents", "delete_many",
+    "delete_one", "distinct", "find_one", "find_one_and_delete",
+    "find_one_and_update", "insert_many", "insert_one", "replace_one",
+    "update_many", "update_one",
+)
+
+
+def _serialized(method, lock):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with lock:
+            return method(*args, **kwargs)
+    return wrapper
+
+
+class MongoTestCase(SimpleTestCase):
+    """Run each test against an empty HRMS database with the unique indexes built."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._patches = []
+        if TEST_MONGO_URI:
+            client = me.connect(db=TEST_DB, host=TEST_MONGO_URI, serverSelectionTimeoutMS=2000)
+            try:
+                client.admin.command("ping")
+            except Exception as e:
+                me.disconnect()
+                raise SkipTest(f"MongoDB at HRMS_TEST_MONGO_URI is unavailable: {e}")
+        elif mongomock is not None:
+            lock = threading.RLock()
+            for name in MONGOMOCK_LOCKED_METHODS:
+                method = getattr(mongomock.collection.Collection, name)
+                cls._patches.append(
+                    mock.patch.object(mongomock.collection.Collection, name, _serialized(method, lock))
+                )
+            for patch in cls._patches:
+                patch.start()
+            me.connect(db=TEST_DB, host="mongodb://localhost", mongo_client_class=mongomock.MongoClient)
+        else:
+            raise SkipTest("Set HRMS_TEST_MONGO_URI or install mongomock to run the MongoDB tests")
+        # The connection middleware must not replace the test client.
+        cls._connected_patch = mock.patch.object(mongo, "_connected_pid", os.getpid())
+        cls._connected_patch.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        me.connection.get_connection().drop_database(TEST_DB)
+        me.disconnect()
+        cls._connected_patch.stop()
+        for patch in reversed(cls._patches):
+            patch.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        db = me.connection.get_db()
+        for name in db.list_collection_names():
+            db.drop_collection(name)
+        ensure_unique_indexes()
+        get_employee_resolver().clear()
+        cache = mock.patch("hrms.cache._response_cache", NullCache())
+        cache.start()
+        self.addCleanup(cache.stop)
+
+    def create_employees(self, count, department="Engineering"):
+        """Insert ``count`` employees E0, E1, ... and return them."""
+        return [
+            Employee(
+                employee_id=f"E{i}", full_name=f"Employee {i}",
+                email=f"e{i}@example.com", department=department
+            ).save()
+            for i in range(count)
+        ]
+
+    def assertRollupsMatchAttendance(self):
+        """Check the per-employee and daily counters against a recount of the attendance."""
+        per_employee = Counter()
+        per_day = Counter()
+        for record in Attendance._get_collection().find():
+            per_employee[(record["employee"], record["status"])] += 1
+            per_day[(record["date"], record["status"])] += 1
+
+        for emp in Employee._get_collection().find():
+            self.assertEqual(
+                (emp.get("present_count", 0), emp.get("absent_count", 0)),
+                (per_employee[(emp["_id"], "Present")], per_employee[(emp["_id"], "Absent")]),
+                f"counters of {emp['employee_id']}"
+            )
+
+        stats = {
+            doc["_id"]: (doc.get("present", 0), doc.get("absent", 0))
+            for doc in DailyAttendanceStats._get_collection().find()
+        }
+        for day in {day for day, _ in per_day}:
+            self.assertEqual(
+                stats.pop(day, (0, 0)), (per_day[(day, "Present")], per_day[(day, "Absent")]),
+                f"daily_attendance_stats of {day:%Y-%m-%d}"
+            )
+        # Dates whose attendance is all gone must be back to zero.
+        for day, counts in stats.items():
+            self.assertEqual(counts, (0, 0), f"daily_attendance_stats of {day:%Y-%m-%d}")
@@ -0,0 +1,170 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+import random
+
+from rest_framework.test import APIClient
+
+from hrms.bulk import mark_attendance_rows
+from hrms.models import Attendance, Employee
+from hrms.rollups import employee_total, seed_employee_total
+
+from .base import MongoTestCase
+
+
+def _mark(payload):
+    return APIClient().post("/api/attendance/mark/", payload, format="json")
+
+
+class MarkAttendanceTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_employees(2)
+
+    def test_first_mark_creates_and_second_updates(self):
+        response = _mark({"employee_id": "E0", "date": "2024-01-01", "status": "Present"})
+        self.assertEqual(response.status_code, 201)
+        response = _mark({"employee_id": "E0", "date": "2024-01-01", "status": "Absent"})
+        self.assertEqual(response.status_code, 200)
+
+        records = list(Attendance.objects(date=date(2024, 1, 1)))
+        self.assertEqual([r.status for r in records], ["Absent"])
+        emp = Employee.objects.get(employee_id="E0")
+        self.assertEqual((emp.present_count, emp.absent_count), (0, 1))
+        self.assertRollupsMatchAttendance()
+
+    def test_same_status_leaves_counters_alone(self):
+        for _ in range(3):
+            _mark({"employee_id": "E0", "date": "2024-01-01", "status": "Present"})
+        emp = Employee.objects.get(employee_id="E0")
+        self.assertEqual((emp.present_count, emp.absent_count), (1, 0))
+        self.assertRollupsMatchAttendance()
+
+    def test_unknown_employee(self):
+        response = _mark({"employee_id": "NOPE", "date": "2024-01-01", "status": "Present"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Attendance.objects.count(), 0)
+
+    def test_delete_employee_removes_its_rollups(self):
+        for employee_id in ("E0", "E1"):
+            _mark({"employee_id": employee_id, "date": "2024-01-01", "status": "Present"})
+        seed_employee_total()
+
+        response = APIClient().delete("/api/employees/E0/delete/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Attendance.objects.count(), 1)
+        self.assertEqual(employee_total(), 1)
+        self.assertRollupsMatchAttendance()
+
+
+class BulkMarkTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_employees(3)
+
+    def test_creates_updates_and_reports_row_errors(self):
+        mark_attendance_rows([{"employee_id": "E0", "date": "2024-01-01", "status": "Present"}])
+
+        results = mark_attendance_rows([
+            {"employee_id": "E0", "date": "2024-01-01", "status": "Absent"},
+            {"employee_id": "E1", "date": "2024-01-01", "status": "Present"},
+            {"employee_id": "E1", "date": "2024-01-01", "status": "Absent"},
+            {"employee_id": "NOPE", "date": "2024-01-01", "status": "Present"},
+            {"employee_id": "E2", "date": "not a date", "status": "Present"},
+        ])
+
+        self.assertEqual(
+            [r["result"] for r in results],
+            ["updated", "created", "error", "error", "error"]
+        )
+        self.assertIn("Duplicate of row 1", results[2]["errors"]["non_field_errors"][0])
+        self.assertIn("employee_id", results[3]["errors"])
+        self.assertIn("date", results[4]["errors"])
+        self.assertEqual(Attendance.objects.count(), 2)
+        self.assertRollupsMatchAttendance()
+
+    def test_endpoint_summary(self):
+        response = APIClient().post("/api/attendance/bulk/", {"records": [
+            {"employee_id": "E0", "date": "2024-01-01", "status": "Present"},
+            {"employee_id": "E1", "date": "2024-01-01", "status": "Absent"},
+        ]}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["summary"], {"created": 2, "updated": 0, "error": 0})
+
+    def test_re_marking_with_the_same_status(self):
+        rows = [{"employee_id": "E0", "date": "2024-01-01", "status": "Present"}]
+        mark_attendance_rows(rows)
+        self.assertEqual(mark_attendance_rows(rows), [{"row": 0, "result": "updated"}])
+        self.assertRollupsMatchAttendance()
+
+
+class ConcurrentMarkTests(MongoTestCase):
+    """Parallel marks must leave the counters equal to a recount."""
+
+    days = [date(2024, 1, 1) + timedelta(days=i) for i in range(3)]
+
+    def setUp(self):
+        super().setUp()
+        self.create_employees(4)
+
+    def _random_row(self, rng):
+        return {
+            "employee_id": f"E{rng.randrange(4)}",
+            "date": str(rng.choice(self.days)),
+            "status": rng.choice(["Present", "Absent"]),
+        }
+
+    def test_single_marks_racing_on_the_same_record(self):
+        payloads = [
+            {"employee_id": "E0", "date": "2024-01-01", "status": "Present" if i % 2 else "Absent"}
+            for i in range(60)
+        ]
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            codes = [r.status_code for r in pool.map(_mark, payloads)]
+
+        self.assertEqual(sorted(set(codes)), [200, 201])
+        self.assertEqual(codes.count(201), 1)
+        self.assertEqual(Attendance.objects.count(), 1)
+        self.assertRollupsMatchAttendance()
+
+    def test_single_marks_on_random_records(self):
+        rng = random.Random(6)
+        payloads = [self._random_row(rng) for _ in range(200)]
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            codes = {r.status_code for r in pool.map(_mark, payloads)}
+
+        self.assertLessEqual(codes, {200, 201})
+        self.assertRollupsMatchAttendance()
+
+    def test_bulk_marks_on_overlapping_records(self):
+        rng = random.Random(4)
+        batches = []
+        for _ in range(40):
+            batch = {}
+            for _ in range(6):
+                row = self._random_row(rng)
+                batch[(row["employee_id"], row["date"])] = row
+            batches.append(list(batch.values()))
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(mark_attendance_rows, batches))
+
+        self.assertFalse([r for batch in results for r in batch if r["result"] == "error"])
+        self.assertRollupsMatchAttendance()
+
+    def test_single_and_bulk_marks_together(self):
+        rng = random.Random(12)
+
+        def work(i):
+            if i % 3:
+                return _mark(self._random_row(rng)).status_code
+            return mark_attendance_rows([self._random_row(rng)])[0]["result"]
+
+        with ThreadPoolExecutor(max_workers=12) as pool:
+            outcomes = set(pool.map(work, range(150)))
+
+        self.assertLessEqual(outcomes, {200, 201, "created", "updated"})
+        self.assertRollupsMatchAttendance()
@@ -0,0 +1,39 @@
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+
+from hrms import mongo
+from hrms.middleware import mongo_connection_middleware
+
+
+class ConnectionMiddlewareTests(SimpleTestCase):
+
+    def _call(self, path):
+        middleware = mongo_connection_middleware(lambda request: "response")
+        with mock.patch.object(mongo, "ensure_connected") as ensure_connected:
+            self.assertEqual(middleware(RequestFactory().get(path)), "response")
+        return ensure_connected.called
+
+    def test_api_requests_connect(self):
+        self.assertTrue(self._call("/api/employees/"))
+
+    def test_health_probes_do_not_wait_for_the_connection(self):
+        self.assertFalse(self._call("/healthz/live"))
+        self.assertFalse(self._call("/healthz/ready"))
+
+
+class BootTaskTests(SimpleTestCase):
+
+    def test_retry_backs_off_until_the_task_succeeds(self):
+        task = mock.Mock(side_effect=[ConnectionError("down")] * 6 + ["done"])
+        with mock.patch.object(mongo.time, "sleep") as sleep:
+            self.assertEqual(mongo._retry(task, "test"), "done")
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [1, 2, 4, 8, 16, 30])
+
+    def test_warm_up_is_bounded_by_the_boot_timeout(self):
+        client = mock.MagicMock()
+        with self.settings(MONGO_BOOT_TIMEOUT_MS=250), \
+                mock.patch.object(mongo.pymongo, "timeout") as timeout:
+            mongo.warm_up(client, 3)
+        self.assertEqual([c.args[0] for c in timeout.call_args_list], [0.25] * 3)
+        self.assertEqual(client.admin.command.call_count, 3)
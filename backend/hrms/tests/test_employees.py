@@ -0,0 +1,150 @@
+import io
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APIClient
+
+from hrms.bulk import import_employees, iter_employee_records
+from hrms.models import Employee
+from hrms.rollups import employee_total, seed_employee_total
+
+from .base import MongoTestCase
+
+
+def _records(text):
+    return iter_employee_records(io.StringIO(text, newline=""))
+
+
+class ImportEmployeesTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_employees(1)
+        seed_employee_total()
+
+    def test_csv_with_duplicates_and_invalid_rows(self):
+        result = import_employees(_records(
+            "employee_id,full_name,email,department\n"
+            "N1,New One,n1@example.com,HR\n"
+            "E0,Taken,taken@example.com,HR\n"
+            "N2,New Two,e0@example.com,HR\n"
+            "N3,New Three,not-an-email,HR\n"
+            "N1,Again,again@example.com,HR\n"
+            "N4,New Four,n4@example.com,HR\n"
+        ), batch_size=2)
+
+        self.assertEqual(result["created"], 2)
+        self.assertEqual([e["row"] for e in result["error_rows"]], [3, 4, 5, 6])
+        self.assertEqual(result["error_rows"][0]["errors"], {"employee_id": ["Employee ID already exists."]})
+        self.assertEqual(result["error_rows"][1]["errors"], {"email": ["Email already exists."]})
+        self.assertIn("email", result["error_rows"][2]["errors"])
+        self.assertIsNone(result["read_error"])
+        self.assertEqual(
+            sorted(Employee.objects.scalar("employee_id")), ["E0", "N1", "N4"]
+        )
+        self.assertEqual(employee_total(), 3)
+
+    def test_ndjson_reports_unparseable_lines(self):
+        result = import_employees(_records(
+            '{"employee_id": "N1", "full_name": "One", "email": "n1@example.com", "department": "HR"}\n'
+            '{"employee_id": "N2", "full_name": \n'
+            '{"employee_id": "N3", "full_name": "Three", "email": "n3@example.com", "department": "HR"}\n'
+        ))
+
+        self.assertEqual(result["created"], 2)
+        self.assertEqual([e["row"] for e in result["error_rows"]], [2])
+
+    def test_json_array_stops_at_a_parse_error(self):
+        result = import_employees(_records(
+            '[{"employee_id": "N1", "full_name": "One", "email": "n1@example.com", "department": "HR"},'
+            ' {"employee_id": "N2", "full_name": '
+        ))
+
+        self.assertEqual(result["created"], 1)
+        self.assertIsNotNone(result["read_error"])
+
+    def test_upload_endpoint(self):
+        upload = SimpleUploadedFile(
+            "employees.json",
+            b'[{"employee_id": "N1", "full_name": "One", "email": "n1@example.com", "department": "HR"}]'
+        )
+        response = APIClient().post("/api/employees/import/", {"file": upload}, format="multipart")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["created"], 1)
+        self.assertTrue(Employee.objects(employee_id="N1").first())
+
+
+class ListEmployeesPaginationTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_employees(7)
+
+    def test_pages_walk_every_employee_newest_first(self):
+        client = APIClient()
+        seen = []
+        after = None
+        pages = 0
+        while True:
+            params = {"limit": 3}
+            if after:
+                params["after"] = after
+            page = client.get("/api/employees/", params).json()
+            seen.extend(row["employee_id"] for row in page["results"])
+            pages += 1
+            after = page["next"]
+            if after is None:
+                break
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, [f"E{i}" for i in reversed(range(7))])
+
+    def test_fields_projection(self):
+        page = APIClient().get("/api/employees/", {"limit": 1, "fields": "employee_id"}).json()
+        self.assertEqual(page["results"], [{"employee_id": "E6"}])
+
+    def test_unpaginated_listing(self):
+        data = APIClient().get("/api/employees/").json()
+        self.assertEqual(len(data), 7)
+
+    def test_invalid_parameters(self):
+        client = APIClient()
+        for params in ({"after": "nope"}, {"limit": 0}, {"limit": "x"}, {"fields": "salary"}):
+            with self.subTest(params=params):
+                self.assertEqual(client.get("/api/employees/", params).status_code, 400)
+
+
+class SearchEmployeesTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for employee_id, full_name, email, department in (
+            ("EMP001", "John Smith", "john.smith@example.com", "Engineering"),
+            ("EMP002", "Jane Smithers", "jane@example.com", "Human Resources"),
+            ("EMP003", "Wei Chen", "wei.chen@example.com", "Engineering"),
+        ):
+            Employee(employee_id=employee_id, full_name=full_name, email=email, department=department).save()
+
+    def _search(self, **params):
+        response = APIClient().get("/api/employees/search/", params)
+        self.assertEqual(response.status_code, 200)
+        return [row["employee_id"] for row in response.json()["results"]]
+
+    def test_prefix_of_any_word_case_insensitive(self):
+        self.assertEqual(self._search(q="SMI"), ["EMP002", "EMP001"])
+        self.assertEqual(self._search(q="chen"), ["EMP003"])
+        self.assertEqual(self._search(q="emp00"), ["EMP003", "EMP002", "EMP001"])
+
+    def test_queries_longer_than_the_indexed_prefix(self):
+        self.assertEqual(self._search(q="john.smith@"), ["EMP001"])
+        self.assertEqual(self._search(q="john.smithers"), [])
+        self.assertEqual(self._search(q="jane smithers"), ["EMP002"])
+
+    def test_department_filter(self):
+        self.assertEqual(self._search(q="e", department="Engineering"), ["EMP003", "EMP001"])
+        self.assertEqual(self._search(department="Human Resources"), ["EMP002"])
+
+    def test_pagination(self):
+        page = APIClient().get("/api/employees/search/", {"q": "emp", "limit": 2}).json()
+        self.assertEqual([row["employee_id"] for row in page["results"]], ["EMP003", "EMP002"])
+        self.assertEqual(self._search(q="emp", after=page["next"]), ["EMP001"])
@@ -0,0 +1,122 @@
+import asyncio
+from datetime import datetime, timedelta
+import json
+import os
+from unittest import mock
+import zlib
+
+from bson import ObjectId
+from django.core.handlers.asgi import ASGIHandler
+from django.test import SimpleTestCase, override_settings
+from django.urls import path
+
+from hrms import async_views, mongo
+
+urlpatterns = [
+    path("api/attendance/export/", async_views.export_attendance),
+]
+
+EMPLOYEE = ObjectId()
+RECORDS = 5000
+
+
+class _Cursor:
+    """Motor-like cursor over the fixture records that counts what was read."""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.consumed = 0
+
+    def sort(self, *args):
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.documents:
+            self.consumed += 1
+            # Yield to the event loop like a real cursor between batches.
+            if self.consumed % 1000 == 0:
+                await asyncio.sleep(0)
+            yield doc
+
+
+class _Collection:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def find(self, *args):
+        return self.cursor
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncExportStreamingTests(SimpleTestCase):
+    """Under ASGI the export must be sent while the cursor is still being read."""
+
+    def setUp(self):
+        day = datetime(2024, 1, 1)
+        self.cursor = _Cursor([
+            {"_id": ObjectId(), "employee": EMPLOYEE, "date": day - timedelta(days=i), "status": "Present"}
+            for i in range(RECORDS)
+        ])
+        employees = _Collection(_Cursor([{"_id": EMPLOYEE, "employee_id": "E0"}]))
+        attendance = _Collection(self.cursor)
+        collections = mock.patch.object(
+            async_views, "_collection",
+            lambda document: employees if document is async_views.Employee else attendance
+        )
+        collections.start()
+        self.addCleanup(collections.stop)
+        connected = mock.patch.object(mongo, "_connected_pid", os.getpid())
+        connected.start()
+        self.addCleanup(connected.stop)
+
+    def _get(self, headers=()):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": "/api/attendance/export/",
+            "query_string": b"", "root_path": "",
+            "headers": [(b"host", b"testserver"), *headers],
+            "server": ("testserver", 80), "client": ("127.0.0.1", 1234),
+        }
+        messages = []
+        consumed_at_first_body = []
+        disconnect = asyncio.Event()
+
+        async def receive():
+            if not messages:
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body") and not consumed_at_first_body:
+                consumed_at_first_body.append(self.cursor.consumed)
+            messages.append(message)
+
+        asyncio.run(ASGIHandler()(scope, receive, send))
+        start = messages[0]
+        bodies = [m.get("body", b"") for m in messages[1:]]
+        return start, bodies, consumed_at_first_body[0]
+
+    def test_first_chunk_is_sent_before_the_cursor_is_exhausted(self):
+        start, bodies, consumed = self._get()
+
+        self.assertEqual(start["status"], 200)
+        self.assertLess(consumed, RECORDS)
+        lines = b"".join(bodies).decode().splitlines()
+        self.assertEqual(len(lines), RECORDS)
+        self.assertEqual(json.loads(lines[0])["employee_id"], "E0")
+        self.assertEqual(self.cursor.consumed, RECORDS)
+
+    def test_compressed_chunks_are_streamed(self):
+        start, bodies, consumed = self._get(headers=[(b"accept-encoding", b"gzip")])
+
+        self.assertIn((b"Content-Encoding", b"gzip"), start["headers"])
+        self.assertLess(consumed, RECORDS)
+        body = zlib.decompress(b"".join(bodies), 31)
+        self.assertEqual(len(body.splitlines()), RECORDS)
@@ -0,0 +1,46 @@
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from bson import ObjectId
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+
+from hrms import renderers
+
+
+class RendererParityTests(SimpleTestCase):
+    """FastJSONRenderer must produce exactly the bytes of DRF's JSONRenderer."""
+
+    payload = {
+        "utc": datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc),
+        "naive": datetime(2024, 1, 2),
+        "offset": datetime(2024, 1, 2, tzinfo=ZoneInfo("Asia/Kolkata")),
+        "date": date(2024, 1, 1),
+        "time": time(1, 2, 3, 4),
+        "duration": timedelta(hours=1),
+        "decimal": Decimal("1.50"),
+        "uuid": UUID("12345678-1234-5678-1234-567812345678"),
+        "tuple": (1, 2),
+        "text": "\u00dcn\u00efcode \u2028 line separator",
+        "nested": [{"present_count": 3, "absent_count": None}],
+    }
+
+    def test_stdlib_matches_drf(self):
+        self.assertEqual(renderers.stdlib_dumps(self.payload), JSONRenderer().render(self.payload))
+
+    def test_orjson_matches_drf(self):
+        if renderers.orjson is None:
+            self.skipTest("orjson is not installed")
+        self.assertEqual(renderers.orjson_dumps(self.payload), JSONRenderer().render(self.payload))
+
+    def test_utc_datetime_ends_with_z(self):
+        self.assertEqual(
+            renderers.dumps({"at": datetime(2024, 1, 2, tzinfo=timezone.utc)}),
+            b'{"at":"2024-01-02T00:00:00Z"}'
+        )
+
+    def test_object_id_is_hex_string(self):
+        oid = ObjectId()
+        self.assertEqual(renderers.dumps([oid]), f'["{oid}"]'.encode())
@@ -1,15 +1,30 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
     create_employee, list_employees, delete_employee,
-    mark_attendance, employee_attendance,dashboard_summary
+    mark_attendance, employee_attendance,dashboard_summary,
+    export_attendance, mark_attendance_bulk, import_employees_upload,
+    cache_stats, db_pool_stats, search_employees
 )
 
+if settings.HRMS_ASYNC_VIEWS:
+    # Motor-backed async reads; only under ASGI (see config/asgi.py).
+    from .async_views import dashboard_summary, employee_attendance, export_attendance, list_employees
+
 urlpatterns = [
     path('dashboard/summary/',dashboard_summary),
     path("employees/", list_employees),
+    path("employees/search/", search_employees),
     path("employees/create/", create_employee),
+    path("employees/import/", import_employees_upload),
     path("employees/<str:employee_id>/delete/", delete_employee),
 
     path("attendance/mark/", mark_attendance),
+    path("attendance/bulk/", mark_attendance_bulk),
+    path("attendance/export/", export_attendance),
+    path("attendance/<str:employee_id>/export/", export_attendance),
     path("attendance/<str:employee_id>/", employee_attendance),
+
+    path("cache/stats/", cache_stats),
+    path("db/pool/", db_pool_stats),
 ]
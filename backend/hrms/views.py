@@ -1,19 +1,55 @@
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, parser_classes
+from rest_framework.exceptions import ParseError, UnsupportedMediaType
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework import status
-from .models import Employee, Attendance
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from .models import SEARCH_PREFIX_LENGTH, Employee, Attendance, normalize_search_text
 from .serializers import EmployeeSerializer, AttendanceSerializer
+from .exports import EXPORT_FORMATS, export_rows, stream_export
+from .rollups import (
+    daily_stats, employee_total, record_attendance_change,
+    record_employee_deleted, record_employees_added
+)
+from .cache import get_response_cache
+from .resolver import get_employee_resolver
+from .indexes import unique_indexes_ready
+from .monitoring import pool_stats
+from .metrics import CONTENT_TYPE_LATEST, metrics_response_body
+from .conditional import (
+    conditional_get, employee_attendance_etag, employee_attendance_last_modified,
+    employee_version, employees_version, list_employees_etag,
+    list_employees_last_modified, version_tag
+)
+from .aggregations import monthly_attendance
+from .bulk import (
+    DUPLICATE_MESSAGES, MAX_BULK_ROWS, duplicate_field, import_employees, iter_employee_records,
+    mark_attendance_rows
+)
 from datetime import date as today_date
 from .exceptions import (
     HRMSException, DatabaseException, ValidationException,
     NotFoundException, ConflictException, format_error_response
 )
 from mongoengine.connection import ConnectionFailure
+from bson import ObjectId
+import calendar
+import io
 import logging
+import re
 import mongoengine as me
 
 logger = logging.getLogger(__name__)
 
+EMPLOYEE_LIST_FIELDS = (
+    "id", "employee_id", "full_name", "email", "department", "present_count", "absent_count"
+)
+DEFAULT_PAGE_SIZE = 100
+SEARCH_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+
 # Error response helper
 def error_response(message, error_code, status_code):
     return Response({
@@ -25,8 +61,19 @@ def error_response(message, error_code, status_code):
 
 @api_view(["POST"])
 def create_employee(request):
+    """
+    Create an employee with a single insert.
+
+    Uniqueness of ``employee_id`` and ``email`` is left to the unique indexes
+    instead of a query per field before the insert (which could race anyway);
+    a duplicate key error is reported as the same field-level 400 error. Until
+    this worker has confirmed the indexes exist (see hrms.indexes) the
+    serializer still runs those queries.
+    """
     try:
-        serializer = EmployeeSerializer(data=request.data)
+        serializer = EmployeeSerializer(
+            data=request.data, context={"check_unique": not unique_indexes_ready()}
+        )
         if not serializer.is_valid():
             logger.warning(f"Validation failed for employee creation: {serializer.errors}")
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -39,13 +86,27 @@ def create_employee(request):
                 department=serializer.validated_data["department"],
             )
             emp.save()
+            record_employees_added()
+            # The ID may still resolve to a deleted employee it belonged to before.
+            get_employee_resolver().forget(emp.employee_id)
+            get_response_cache().invalidate("employees", "dashboard", f"employee:{emp.employee_id}")
             logger.info(f"Employee created successfully: {emp.employee_id}")
             return Response(
                 {"message": "Employee created successfully", "id": str(emp.id)},
                 status=status.HTTP_201_CREATED
             )
         except me.NotUniqueError as e:
-            logger.error(f"Duplicate employee record: {str(e)}")
+            field = duplicate_field(str(e))
+            if field == "non_field_errors":
+                # The error message did not name the index; find the taken value.
+                data = serializer.validated_data
+                if Employee.objects(employee_id=data["employee_id"]).only("id").first():
+                    field = "employee_id"
+                elif Employee.objects(email=data["email"]).only("id").first():
+                    field = "email"
+            logger.warning(f"Duplicate employee record ({field}): {str(e)}")
+            if field in ("employee_id", "email"):
+                return Response({field: [DUPLICATE_MESSAGES[field]]}, status=status.HTTP_400_BAD_REQUEST)
             return error_response(
                 "Employee ID or Email already exists",
                 "DUPLICATE_ENTRY",
@@ -65,6 +126,9 @@ def create_employee(request):
                 "DB_ERROR",
                 status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+    except (ParseError, UnsupportedMediaType) as e:
+        logger.warning(f"Unreadable request body in create_employee: {str(e)}")
+        return error_response(str(e.detail), "INVALID_REQUEST_BODY", e.status_code)
     except Exception as e:
         logger.error(f"Unexpected error in create_employee: {str(e)}")
         return error_response(
@@ -74,24 +138,182 @@ def create_employee(request):
         )
 
 
+@api_view(["POST"])
+@parser_classes([MultiPartParser])
+def import_employees_upload(request):
+    """
+    Import employees from an uploaded CSV, JSON array or NDJSON file.
+
+    The file (multipart field ``file``) is read incrementally and imported in
+    batches. Rows that fail validation or collide with an existing employee
+    are reported by row number; all other rows are created.
+    """
+    try:
+        upload = request.FILES.get("file")
+        if not upload:
+            return error_response(
+                "Upload a CSV or JSON file in the 'file' field",
+                "VALIDATION_ERROR",
+                status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+            result = import_employees(iter_employee_records(stream))
+        except me.ConnectionFailure as e:
+            logger.error(f"Database connection error: {str(e)}")
+            return error_response(
+                "Database connection error",
+                "DB_CONNECTION_ERROR",
+                status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        except Exception as e:
+            logger.error(f"Error importing employees: {str(e)}")
+            return error_response(
+                "Error importing employees",
+                "DB_ERROR",
+                status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        get_response_cache().invalidate("employees", "dashboard", "attendance")
+        logger.info(f"Imported {result['created']} employees from {upload.name}")
+        return Response(result, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Unexpected error in import_employees_upload: {str(e)}")
+        return error_response(
+            "An unexpected error occurred",
+            "INTERNAL_ERROR",
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+def _parse_employee_list_params(query_params):
+    """
+    Parse the pagination and projection query parameters of list_employees.
+
+    Args:
+        query_params: The request query parameters
+
+    Returns:
+        Tuple of (fields, after, limit). ``limit`` is None for the
+        unpaginated listing.
+
+    Raises:
+        ValidationException: If a parameter is invalid
+    """
+    fields = EMPLOYEE_LIST_FIELDS
+    raw_fields = query_params.get("fields")
+    if raw_fields:
+        fields = tuple(f.strip() for f in raw_fields.split(",") if f.strip())
+        unknown = [f for f in fields if f not in EMPLOYEE_LIST_FIELDS]
+        if unknown or not fields:
+            raise ValidationException(
+                f"Unknown fields requested: {', '.join(unknown)}. "
+                f"Allowed fields: {', '.join(EMPLOYEE_LIST_FIELDS)}"
+            )
+
+    after = query_params.get("after")
+    raw_limit = query_params.get("limit")
+    if after is None and raw_limit is None:
+        return fields, None, None
+
+    if after is not None and not ObjectId.is_valid(after):
+        raise ValidationException("'after' must be a cursor returned as 'next' by a previous page")
+
+    limit = DEFAULT_PAGE_SIZE
+    if raw_limit is not None:
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            raise ValidationException("'limit' must be an integer")
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValidationException(f"'limit' must be between 1 and {MAX_PAGE_SIZE}")
+
+    return fields, after, limit
+
+
+def _employee_row(doc, fields):
+    """
+    Build an employee list row from a raw employee document.
+
+    Args:
+        doc: The document as stored (``_id`` plus the projected fields)
+        fields: The fields to return, from EMPLOYEE_LIST_FIELDS
+    """
+    row = {}
+    for f in fields:
+        if f == "id":
+            row[f] = str(doc["_id"])
+        elif f in ("present_count", "absent_count"):
+            row[f] = doc.get(f, 0)
+        else:
+            row[f] = doc.get(f)
+    return row
+
+
+def _employee_list_payload(fields, after, limit, employees=None):
+    """
+    Build the list_employees response body.
+
+    Args:
+        employees: Optional filtered queryset to list instead of every employee
+
+    Returns:
+        A list of employees, or a ``{"results", "next"}`` page when ``limit``
+        is set
+    """
+    if employees is None:
+        employees = Employee.objects()
+    if after is not None:
+        employees = employees(id__lt=ObjectId(after))
+    # Raw projected documents: the rows are built straight from them.
+    employees = employees.order_by("-id").only(*fields).as_pymongo()
+
+    next_cursor = None
+    if limit is not None:
+        employees = list(employees.limit(limit + 1))
+        if len(employees) > limit:
+            employees = employees[:limit]
+            next_cursor = str(employees[-1]["_id"])
+
+    data = [_employee_row(e, fields) for e in employees]
+
+    if limit is not None:
+        return {"results": data, "next": next_cursor}
+    return data
+
+
+@conditional_get(list_employees_etag, list_employees_last_modified)
 @api_view(["GET"])
 def list_employees(request):
+    """
+    List employees, newest first.
+
+    Without ``after``/``limit`` the whole collection is returned as a list.
+    With either parameter the response is a keyset-paginated page of the form
+    ``{"results": [...], "next": <cursor or null>}``; pass ``next`` back as
+    ``after`` to fetch the following page. ``fields`` restricts the returned
+    (and loaded) fields to a comma-separated subset.
+    """
     try:
-        employees = Employee.objects().order_by("-id")
-        data = [
-            {
-                "id": str(e.id),
-                "employee_id": e.employee_id,
-                "full_name": e.full_name,
-                "email": e.email,
-                "department": e.department,
-                "present_count": Attendance.objects(employee=e.id, status="Present").count(),
-                "absent_count": Attendance.objects(employee=e.id, status="Absent").count()
-            }
-            for e in employees
-        ]
+        try:
+            fields, after, limit = _parse_employee_list_params(request.query_params)
+        except ValidationException as e:
+            logger.warning(f"Invalid employee list parameters: {e.message}")
+            return error_response(e.message, e.error_code, e.status_code)
+
+        # The stored version in the key keeps every worker's cache in step
+        # with the ETag, even if a local cache missed an invalidation.
+        payload = get_response_cache().get_or_set(
+            "list_employees",
+            f"{version_tag(employees_version(request))}:{request.query_params.urlencode()}",
+            ("employees",),
+            lambda: _employee_list_payload(fields, after, limit)
+        )
+        data = payload["results"] if limit is not None else payload
+
         logger.info(f"Retrieved {len(data)} employees")
-        return Response(data)
+        return Response(payload)
     except me.ConnectionFailure as e:
         logger.error(f"Database connection error: {str(e)}")
         return error_response(
@@ -108,6 +330,72 @@ def list_employees(request):
         )
 
 
+def _employee_search_filters(query_params):
+    """
+    Build the Employee filters for search_employees.
+
+    Raises:
+        ValidationException: If neither ``q`` nor ``department`` is given
+    """
+    query = normalize_search_text(query_params.get("q"))
+    department = query_params.get("department")
+    if not query and not department:
+        raise ValidationException("Provide a search term 'q' and/or a 'department'")
+
+    filters = {}
+    if query:
+        # An equality match on the indexed prefix, so the index also yields
+        # the newest-first order; longer queries are matched in full against
+        # the lowercased terms (see SEARCH_PREFIX_LENGTH).
+        filters["search_prefixes"] = query[:SEARCH_PREFIX_LENGTH]
+        if len(query) > SEARCH_PREFIX_LENGTH:
+            filters["__raw__"] = {"search_terms": {"$regex": f"^{re.escape(query)}"}}
+    if department:
+        filters["department"] = department
+    return filters
+
+
+@conditional_get(list_employees_etag, list_employees_last_modified)
+@api_view(["GET"])
+def search_employees(request):
+    """
+    Search employees by prefix of employee_id, name, email or department.
+
+    ``q`` is matched case-insensitively against the start of each field and
+    of each word in the name and department; ``department`` filters on an
+    exact department. Results are newest first and always keyset-paginated
+    like list_employees (``limit`` defaults to 20), and ``fields`` works the
+    same way.
+    """
+    try:
+        try:
+            filters = _employee_search_filters(request.query_params)
+            fields, after, limit = _parse_employee_list_params(request.query_params)
+        except ValidationException as e:
+            logger.warning(f"Invalid employee search parameters: {e.message}")
+            return error_response(e.message, e.error_code, e.status_code)
+
+        if request.query_params.get("limit") is None:
+            limit = SEARCH_PAGE_SIZE
+        payload = _employee_list_payload(fields, after, limit, Employee.objects(**filters))
+
+        logger.info(f"Employee search returned {len(payload['results'])} employees")
+        return Response(payload)
+    except me.ConnectionFailure as e:
+        logger.error(f"Database connection error: {str(e)}")
+        return error_response(
+            "Database connection error",
+            "DB_CONNECTION_ERROR",
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    except Exception as e:
+        logger.error(f"Error searching employees: {str(e)}")
+        return error_response(
+            "Error searching employees",
+            "DB_ERROR",
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
 
 @api_view(["DELETE"])
 def delete_employee(request, employee_id):
@@ -122,7 +410,12 @@ def delete_employee(request, employee_id):
             )
         
         try:
-            emp.delete()
+            # Remove the employee first so concurrent marks stop counting, then
+            # the attendance with the rollup decrements for what was removed.
+            Employee._get_collection().delete_one({"_id": emp.id})
+            record_employee_deleted(emp.id)
+            get_employee_resolver().forget(employee_id)
+            get_response_cache().invalidate("employees", "dashboard", f"employee:{employee_id}")
             logger.info(f"Employee deleted successfully: {employee_id}")
             return Response(
                 {"message": "Employee deleted successfully"},
@@ -146,6 +439,27 @@ def delete_employee(request, employee_id):
 
 # ------------------ Attendance ------------------
 
+def _upsert_attendance(emp_oid, employee_id, date, status_value):
+    """
+    Create or update an attendance record in a single find_one_and_update.
+
+    Relies on the unique (employee, date) index instead of a prior lookup. When
+    two concurrent upserts race to insert the same record, the loser gets a
+    duplicate key error and is retried once, which then matches the winner's
+    document and updates it.
+
+    Returns:
+        The record as it was before the write (only ``status`` loaded), or
+        None if it was created
+    """
+    records = Attendance.objects(employee=emp_oid, date=date).only("status")
+    try:
+        return records.modify(upsert=True, new=False, set__status=status_value)
+    except me.NotUniqueError:
+        logger.info(f"Concurrent attendance upsert for {employee_id} on {date}, retrying")
+        return records.modify(upsert=True, new=False, set__status=status_value)
+
+
 @api_view(["POST"])
 def mark_attendance(request):
     try:
@@ -155,24 +469,32 @@ def mark_attendance(request):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            emp = serializer.validated_data["employee"]
+            emp_oid = serializer.validated_data["employee"]
+            employee_id = serializer.validated_data["employee_id"]
             date = serializer.validated_data["date"]
             status_value = serializer.validated_data["status"]
 
-            existing = Attendance.objects(employee=emp, date=date).first()
-            
             try:
-                if existing:
-                    existing.status = status_value
-                    existing.save()
-                    logger.info(f"Attendance updated for {emp.employee_id} on {date}")
+                previous = _upsert_attendance(emp_oid, employee_id, date, status_value)
+                if not record_attendance_change(emp_oid, date, previous.status if previous else None, status_value):
+                    # Deleted after this worker resolved its ID; drop the orphan record.
+                    Attendance.objects(employee=emp_oid).delete()
+                    get_employee_resolver().forget(employee_id)
+                    logger.warning(f"Employee deleted while marking attendance: {employee_id}")
+                    return error_response(
+                        f"Employee with ID '{employee_id}' not found",
+                        "NOT_FOUND",
+                        status.HTTP_404_NOT_FOUND
+                    )
+                get_response_cache().invalidate("employees", "dashboard", f"employee:{employee_id}")
+                if previous is not None:
+                    logger.info(f"Attendance updated for {employee_id} on {date}")
                     return Response(
                         {"message": "Attendance updated successfully"},
                         status=status.HTTP_200_OK
                     )
 
-                Attendance(employee=emp, date=date, status=status_value).save()
-                logger.info(f"Attendance marked for {emp.employee_id} on {date}")
+                logger.info(f"Attendance marked for {employee_id} on {date}")
                 return Response(
                     {"message": "Attendance marked successfully"},
                     status=status.HTTP_201_CREATED
@@ -205,6 +527,9 @@ def mark_attendance(request):
                 "PROCESSING_ERROR",
                 status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+    except (ParseError, UnsupportedMediaType) as e:
+        logger.warning(f"Unreadable request body in mark_attendance: {str(e)}")
+        return error_response(str(e.detail), "INVALID_REQUEST_BODY", e.status_code)
     except Exception as e:
         logger.error(f"Unexpected error in mark_attendance: {str(e)}")
         return error_response(
@@ -215,43 +540,227 @@ def mark_attendance(request):
 
 
 
-@api_view(["GET"])
-def employee_attendance(request, employee_id):
+@api_view(["POST"])
+def mark_attendance_bulk(request):
+    """
+    Mark attendance for many employees in one request.
+
+    Accepts either a list of ``{employee_id, date, status}`` rows or an object
+    with a ``records`` list, and returns a per-row result plus totals.
+    """
     try:
-        emp = Employee.objects(employee_id=employee_id).first()
-        if not emp:
-            logger.warning(f"Employee not found: {employee_id}")
+        rows = request.data.get("records") if isinstance(request.data, dict) else request.data
+        if not isinstance(rows, list) or not rows:
             return error_response(
-                f"Employee with ID '{employee_id}' not found",
-                "NOT_FOUND",
-                status.HTTP_404_NOT_FOUND
+                "Expected a non-empty list of attendance records",
+                "VALIDATION_ERROR",
+                status.HTTP_400_BAD_REQUEST
+            )
+        if len(rows) > MAX_BULK_ROWS:
+            return error_response(
+                f"A bulk request may contain at most {MAX_BULK_ROWS} records",
+                "VALIDATION_ERROR",
+                status.HTTP_400_BAD_REQUEST
             )
 
         try:
-            records = Attendance.objects(employee=emp).order_by("-date")
-            data = [
-                {
-                    "id": str(r.id),
-                    "date": str(r.date),
-                    "status": r.status
-                }
-                for r in records
-            ]
-
-            present_count = Attendance.objects(employee=emp, status="Present").count()
-            absent_count = Attendance.objects(employee=emp, status="Absent").count()
-            
-            logger.info(f"Retrieved attendance records for {employee_id}")
-            return Response({
-                "employee": {
-                    "employee_id": emp.employee_id,
-                    "full_name": emp.full_name,
-                    "department": emp.department,
-                },
-                "present_days": present_count,
-                "absent_days": absent_count,
-                "records": data
-            })
+            results = mark_attendance_rows(rows)
+        except me.ConnectionFailure as e:
+            logger.error(f"Database connection error: {str(e)}")
+            return error_response(
+                "Database connection error",
+                "DB_CONNECTION_ERROR",
+                status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        except Exception as e:
+            logger.error(f"Error marking bulk attendance: {str(e)}")
+            return error_response(
+                "Error marking attendance",
+                "DB_ERROR",
+                status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        # A batch touches many employees; bump the shared attendance namespace
+        # instead of one version per employee.
+        get_response_cache().invalidate("employees", "dashboard", "attendance")
+
+        summary = {"created": 0, "updated": 0, "error": 0}
+        for result in results:
+            summary[result["result"]] += 1
+        logger.info(f"Bulk attendance processed: {summary}")
+        return Response({"summary": summary, "results": results}, status=status.HTTP_200_OK)
+    except (ParseError, UnsupportedMediaType) as e:
+        logger.warning(f"Unreadable request body in mark_attendance_bulk: {str(e)}")
+        return error_response(str(e.detail), "INVALID_REQUEST_BODY", e.status_code)
+    except Exception as e:
+        logger.error(f"Unexpected error in mark_attendance_bulk: {str(e)}")
+        return error_response(
+            "An unexpected error occurred",
+            "INTERNAL_ERROR",
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+def _parse_date_range(query_params):
+    """
+    Parse the optional ``from``/``to`` date range query parameters.
+
+    Args:
+        query_params: The request query parameters
+
+    Returns:
+        Tuple of (start, end) dates, either of which may be None
+
+    Raises:
+        ValidationException: If a date is malformed or the range is inverted
+    """
+    parsed = {}
+    for name in ("from", "to"):
+        value = query_params.get(name)
+        if value:
+            try:
+                parsed[name] = today_date.fromisoformat(value)
+            except ValueError:
+                raise ValidationException(f"'{name}' must be a date in YYYY-MM-DD format")
+
+    start, end = parsed.get("from"), parsed.get("to")
+    if start and end and start > end:
+        raise ValidationException("'from' must not be after 'to'")
+    return start, end
+
+
+def _date_range_filters(start, end):
+    filters = {}
+    if start:
+        filters["date__gte"] = start
+    if end:
+        filters["date__lte"] = end
+    return filters
+
+
+MONTH_PATTERN = re.compile(r"^(\d{4})-(\d{2})$")
+ATTENDANCE_SUMMARIES = ("monthly",)
+# Employee fields employee_attendance reads.
+ATTENDANCE_EMPLOYEE_FIELDS = ("employee_id", "full_name", "department", "present_count", "absent_count")
+
+
+def _parse_attendance_filters(query_params):
+    """
+    Parse the employee_attendance query parameters.
+
+    Accepts either a ``from``/``to`` date range or ``month=YYYY-MM``, plus
+    ``summary=monthly`` for a per-month Present/Absent breakdown.
+
+    Returns:
+        Tuple of (start, end, summary), any of which may be None
+
+    Raises:
+        ValidationException: If a parameter is malformed or month is combined
+            with from/to
+    """
+    start, end = _parse_date_range(query_params)
+
+    month = query_params.get("month")
+    if month:
+        if start or end:
+            raise ValidationException("'month' cannot be combined with 'from'/'to'")
+        match = MONTH_PATTERN.match(month)
+        if not match or not 1 <= int(match.group(2)) <= 12:
+            raise ValidationException("'month' must be in YYYY-MM format")
+        year, month_number = int(match.group(1)), int(match.group(2))
+        start = today_date(year, month_number, 1)
+        end = today_date(year, month_number, calendar.monthrange(year, month_number)[1])
+
+    summary = query_params.get("summary") or None
+    if summary is not None and summary not in ATTENDANCE_SUMMARIES:
+        raise ValidationException(f"'summary' must be one of: {', '.join(ATTENDANCE_SUMMARIES)}")
+
+    return start, end, summary
+
+
+def _attendance_row(doc):
+    """Build an attendance record row from a raw document (dates are stored as datetimes)."""
+    return {
+        "id": str(doc["_id"]),
+        "date": str(doc["date"].date()),
+        "status": doc["status"]
+    }
+
+
+def _attendance_payload_base(emp, data):
+    """
+    Build the employee_attendance payload from a raw employee document
+    (ATTENDANCE_EMPLOYEE_FIELDS) and its record rows.
+    """
+    return {
+        "employee": {
+            "employee_id": emp["employee_id"],
+            "full_name": emp.get("full_name"),
+            "department": emp.get("department"),
+        },
+        "present_days": emp.get("present_count", 0),
+        "absent_days": emp.get("absent_count", 0),
+        "records": data
+    }
+
+
+def _employee_attendance_payload(employee_id, start=None, end=None, summary=None):
+    """
+    Build the employee_attendance response body.
+
+    Without a date range, present_days/absent_days come from the counters on
+    the Employee document. With one, they count the records in the range.
+
+    Returns:
+        The payload dictionary, or None if the employee does not exist
+    """
+    emp = (
+        Employee.objects(employee_id=employee_id)
+        .only(*ATTENDANCE_EMPLOYEE_FIELDS)
+        .as_pymongo()
+        .first()
+    )
+    if not emp:
+        return None
+
+    # Equality on employee plus a range on date: a bounded scan of the
+    # (employee, date) index, read backwards for the -date order.
+    records = (
+        Attendance.objects(employee=emp["_id"], **_date_range_filters(start, end))
+        .only("date", "status")
+        .order_by("-date")
+        .as_pymongo()
+    )
+    data = [_attendance_row(r) for r in records]
+
+    payload = _attendance_payload_base(emp, data)
+    if start or end:
+        payload["from"] = str(start) if start else None
+        payload["to"] = str(end) if end else None
+        payload["present_days"] = sum(1 for r in data if r["status"] == "Present")
+        payload["absent_days"] = len(data) - payload["present_days"]
+    if summary == "monthly":
+        payload["monthly"] = monthly_attendance(emp["_id"], start, end)
+    return payload
+
+
+@conditional_get(employee_attendance_etag, employee_attendance_last_modified)
+@api_view(["GET"])
+def employee_attendance(request, employee_id):
+    try:
+        try:
+            start, end, summary = _parse_attendance_filters(request.query_params)
+        except ValidationException as e:
+            logger.warning(f"Invalid attendance query parameters: {e.message}")
+            return error_response(e.message, e.error_code, e.status_code)
+
+        try:
+            payload = get_response_cache().get_or_set(
+                "employee_attendance",
+                f"{version_tag(employee_version(request, employee_id))}:{employee_id}:{start}:{end}:{summary}",
+                ("attendance", f"employee:{employee_id}"),
+                lambda: _employee_attendance_payload(employee_id, start, end, summary)
+            )
         except me.ConnectionFailure as e:
             logger.error(f"Database connection error: {str(e)}")
             return error_response(
@@ -266,6 +775,17 @@ def employee_attendance(request, employee_id):
                 "DB_ERROR",
                 status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+        if payload is None:
+            logger.warning(f"Employee not found: {employee_id}")
+            return error_response(
+                f"Employee with ID '{employee_id}' not found",
+                "NOT_FOUND",
+                status.HTTP_404_NOT_FOUND
+            )
+
+        logger.info(f"Retrieved attendance records for {employee_id}")
+        return Response(payload)
     except Exception as e:
         logger.error(f"Unexpected error in employee_attendance: {str(e)}")
         return error_response(
@@ -275,26 +795,131 @@ def employee_attendance(request, employee_id):
         )
 
 
-@api_view(["GET"])
-def dashboard_summary(request):
+# ------------------ Attendance export ------------------
+
+def _parse_export_params(query_params):
+    """
+    Parse the ``format`` and ``from``/``to`` query parameters of an export.
+
+    Returns:
+        Tuple of (export format, start, end)
+
+    Raises:
+        ValidationException: If a parameter is invalid
+    """
+    export_format = query_params.get("format", "ndjson")
+    if export_format not in EXPORT_FORMATS:
+        raise ValidationException(f"'format' must be one of: {', '.join(EXPORT_FORMATS)}")
+    start, end = _parse_date_range(query_params)
+    return export_format, start, end
+
+
+def _export_disposition(employee_id, export_format):
+    """Return the Content-Disposition header of an export."""
+    filename = "attendance"
+    if employee_id is not None:
+        filename += "-" + re.sub(r"[^A-Za-z0-9_.-]", "_", employee_id)
+    return f'attachment; filename="{filename}.{export_format}"'
+
+
+def _export_error(message, error_code, status_code):
+    return JsonResponse({"error": error_code, "message": message}, status=status_code)
+
+
+@require_GET
+def export_attendance(request, employee_id=None):
+    """
+    Stream attendance history as NDJSON (default) or CSV.
+
+    Exports a single employee when ``employee_id`` is given, otherwise the whole
+    organisation. Supports ``?format=ndjson|csv`` and an optional
+    ``?from=&to=`` date range. This is a plain Django view because DRF reserves
+    the ``format`` query parameter for renderer negotiation.
+    """
     try:
-        today = today_date.today()
+        try:
+            export_format, start, end = _parse_export_params(request.GET)
+        except ValidationException as e:
+            logger.warning(f"Invalid attendance export parameters: {e.message}")
+            return _export_error(e.message, e.error_code, e.status_code)
+
+        filters = _date_range_filters(start, end)
+        if employee_id is not None:
+            emp_oid = get_employee_resolver().resolve(employee_id)
+            if not emp_oid:
+                logger.warning(f"Employee not found: {employee_id}")
+                return _export_error(
+                    f"Employee with ID '{employee_id}' not found",
+                    "NOT_FOUND",
+                    status.HTTP_404_NOT_FOUND
+                )
+            filters["employee"] = emp_oid
+            employee_ids = {emp_oid: employee_id}
+            ordering = ("-date",)
+        else:
+            employee_ids = {
+                doc["_id"]: doc["employee_id"]
+                for doc in Employee.objects.only("employee_id").as_pymongo()
+            }
+            # Walks the (employee, date) index backwards instead of sorting in memory.
+            ordering = ("-employee", "-date")
+
+        documents = (
+            Attendance.objects(**filters)
+            .order_by(*ordering)
+            .batch_size(EXPORT_BATCH_SIZE)
+            .as_pymongo()
+        )
+        response = StreamingHttpResponse(
+            stream_export(export_format, export_rows(documents, employee_ids)),
+            content_type=EXPORT_FORMATS[export_format]
+        )
+        response["Content-Disposition"] = _export_disposition(employee_id, export_format)
+        logger.info(f"Streaming {export_format} attendance export for {employee_id or 'all employees'}")
+        return response
+    except me.ConnectionFailure as e:
+        logger.error(f"Database connection error: {str(e)}")
+        return _export_error(
+            "Database connection error",
+            "DB_CONNECTION_ERROR",
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error in export_attendance: {str(e)}")
+        return _export_error(
+            "An unexpected error occurred",
+            "INTERNAL_ERROR",
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+def _dashboard_payload(today):
+    total_employees = employee_total()
+    stats = daily_stats(today)
+    present_today = stats["present"]
+    absent_today = stats["absent"]
 
-        total_employees = Employee.objects.count()
+    marked_today = present_today + absent_today
+    not_marked_today = max(total_employees - marked_today, 0)
 
-        present_today = Attendance.objects(date=today, status="Present").count()
-        absent_today = Attendance.objects(date=today, status="Absent").count()
+    return {
+        "date": str(today),
+        "total_employees": total_employees,
+        "present_today": present_today,
+        "absent_today": absent_today,
+        "not_marked_today": not_marked_today
+    }
 
-        marked_today = Attendance.objects(date=today).count()
-        not_marked_today = max(total_employees - marked_today, 0)
 
-        return Response({
-            "date": str(today),
-            "total_employees": total_employees,
-            "present_today": present_today,
-            "absent_today": absent_today,
-            "not_marked_today": not_marked_today
-        }, status=status.HTTP_200_OK)
+@api_view(["GET"])
+def dashboard_summary(request):
+    try:
+        today = today_date.today()
+        payload = get_response_cache().get_or_set(
+            "dashboard_summary", str(today), ("dashboard",),
+            lambda: _dashboard_payload(today)
+        )
+        return Response(payload, status=status.HTTP_200_OK)
 
     except ConnectionFailure as e:
         logger.error(f"MongoDB connection failure: {e}")
@@ -304,4 +929,28 @@ def dashboard_summary(request):
     except Exception as e:
         logger.error(f"Unexpected error in dashboard_summary: {e}")
         return Response({"message": "Internal Server Error"},
-                        status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+                        status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# ------------------ Cache ------------------
+
+@api_view(["GET"])
+def cache_stats(request):
+    """Report hit/miss counters of this worker's response cache."""
+    return Response(get_response_cache().stats(), status=status.HTTP_200_OK)
+
+
+# ------------------ Database ------------------
+
+@api_view(["GET"])
+def db_pool_stats(request):
+    """Report this worker's MongoDB connection pool and slow command counters."""
+    return Response(pool_stats(), status=status.HTTP_200_OK)
+
+
+# ------------------ Metrics ------------------
+
+@require_GET
+def metrics(request):
+    """Serve the Prometheus metrics of this worker, or of all workers in multiprocess mode."""
+    return HttpResponse(metrics_response_body(), content_type=CONTENT_TYPE_LATEST)
@@ -65,13 +65,31 @@ export default function Employees() {
     }
 
     const [searchTerm, setSearchTerm] = useState("");
+    const [searchResults, setSearchResults] = useState([]);
 
-    const filteredEmployees = employees.filter((emp) =>
-        emp.employee_id.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        emp.full_name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        emp.email.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        emp.department.toLowerCase().includes(searchTerm.toLowerCase())
-    );
+    // Search on the server, debounced, instead of filtering the full list.
+    useEffect(() => {
+        const q = searchTerm.trim();
+        if (!q) {
+            setSearchResults([]);
+            return;
+        }
+        let cancelled = false;
+        const timer = setTimeout(async () => {
+            try {
+                const res = await api.get("/employees/search/", { params: { q, limit: 100 } });
+                if (!cancelled) setSearchResults(res.data.results);
+            } catch {
+                if (!cancelled) setError("Failed to search employees.");
+            }
+        }, 250);
+        return () => {
+            cancelled = true;
+            clearTimeout(timer);
+        };
+    }, [searchTerm, employees]);
+
+    const filteredEmployees = searchTerm.trim() ? searchResults : employees;
 
     return (
         <div className="min-h-screen bg-linear-to-br from-blue-50 to-indigo-100 p-6">